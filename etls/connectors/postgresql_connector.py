@@ -1,11 +1,14 @@
 # import libraries
-import psycopg2, io, csv, configparser, os
+import psycopg2, io, csv, configparser, os, gzip, threading
+from contextlib import contextmanager
 import pandas as pd
 from io import StringIO
 from psycopg2 import DatabaseError
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from psycopg2.extensions import connection as PGConnection
 import configparser, os
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 import utilities.logging_manager as lg
 
 class PostgresqlConnector:
@@ -20,9 +23,19 @@ class PostgresqlConnector:
     5. DML / ETL Helpers: Upload CSVs via temporary tables and merge into targets.
     """
 
+    # Parsed credentials keyed by (config path, config mtime, credential name)
+    _config_cache: Dict[Tuple[str, float, str], Dict[str, str]] = {}
+
+    # Read buffer and COPY chunk size used when streaming a file into the database
+    _copy_buffer_size = 1 << 20
+
     def __init__(self,
-                 credential_name: str) -> None:
+                 credential_name: str,
+                 max_connections: int = 8) -> None:
         self.credential_name = credential_name
+        self.max_connections = max_connections      # Upper bound of the connection pool used by run_query
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
 
 
     # ---------------------------------------------------------
@@ -38,7 +51,9 @@ class PostgresqlConnector:
             credential_name: The credential_name name inside the config file that contains the PostgreSQL credentials
             (e.g. "postgresql_prod").
 
-        Returns: A dictionary containing the key/value pairs from the credential_name
+        Returns: A dictionary containing the key/value pairs from the credential_name.
+            The parsed result is cached until the config file's modification time changes;
+            each call returns a fresh copy.
 
         Raises:
             FileNotFoundError:
@@ -62,19 +77,26 @@ class PostgresqlConnector:
         if not os.path.isfile(cfg_path):
             raise FileNotFoundError(f"Config file not found: {cfg_path}.")
 
+        # 2. Reuse the parsed credentials while the file is unchanged
+        cache_key = (cfg_path, os.path.getmtime(cfg_path), credential_name)
+        cached_cfg = PostgresqlConnector._config_cache.get(cache_key)
+        if cached_cfg is not None:
+            return dict(cached_cfg)
+
         parser = configparser.ConfigParser()
 
-        # 2. Read the file; unreadable files result in an empty read list
+        # 3. Read the file; unreadable files result in an empty read list
         if not parser.read(cfg_path):
             raise ValueError(f"Config file '{cfg_path}' could not be read.")
 
-        # 3. Ensure the requested credential_name exists
+        # 4. Ensure the requested credential_name exists
         if credential_name not in parser:
             raise ValueError(f"Credential: {credential_name} not found in config file!")
 
-        # 4. Convert the credential_name into a Python dictionary
+        # 5. Convert the credential_name into a Python dictionary and cache it
         cfg = dict(parser[credential_name])
-        return cfg
+        PostgresqlConnector._config_cache[cache_key] = cfg
+        return dict(cfg)
 
     # ---------------------------------------------------------
     # CONNECTION FACTORY
@@ -100,6 +122,19 @@ class PostgresqlConnector:
                 If the connection attempt fails.
         """
 
+        # 1. Create the connection
+        return psycopg2.connect(**PostgresqlConnector._connection_kwargs(cfg))
+
+    @staticmethod
+    def _connection_kwargs(cfg: Dict[str, str]) -> Dict[str, str]:
+        """
+        Validate the connection parameters and return the keyword arguments of psycopg2.connect.
+
+        Raises:
+            KeyError:
+                If required connection keys are missing.
+        """
+
         # 1. Validate required keys exist
         required = ['host', 'port', 'database', 'user', 'password']
         for key in required:
@@ -110,8 +145,8 @@ class PostgresqlConnector:
         sslmode = cfg.get('sslmode')             # e.g. 'require', 'disable'
         timeout = cfg.get('connection_timeout')  # seconds
 
-        # 3. Create the connection
-        return psycopg2.connect(
+        # 3. Build the keyword arguments
+        return dict(
             host        = cfg['host'],
             port        = cfg['port'],
             database    = cfg['database'],
@@ -119,12 +154,38 @@ class PostgresqlConnector:
             password    = cfg['password']
         )
 
+    def _get_pool(self) -> ThreadedConnectionPool:
+        """
+        Return the connection pool of this connector, creating it on first use.
+        The pool is thread-safe, so tasks running in parallel can share it.
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                cfg = PostgresqlConnector.load_db_config(self.credential_name)
+                self._pool = ThreadedConnectionPool(minconn=1,
+                                                    maxconn=self.max_connections,
+                                                    **PostgresqlConnector._connection_kwargs(cfg))
+            return self._pool
+
+    @contextmanager
+    def _pooled_connection(self) -> Iterator[PGConnection]:
+        """
+        Borrow a connection from the pool of this connector and give it back afterwards.
+        Broken connections are discarded instead of being returned to the pool.
+        """
+        pool = self._get_pool()
+        conn = pool.getconn()
+        try:
+            yield conn
+        finally:
+            pool.putconn(conn, close=bool(conn.closed))
+
     # ---------------------------------------------------------
     # EXECUTE QUERY
     # ---------------------------------------------------------
     def run_query(self,
                   query: str,
-                  params: Optional[Tuple[Any, ...]] = None,
+                  params: Optional[Union[Tuple[Any, ...], Dict[str, Any]]] = None,
                   get_result: bool = True,
                   commit: bool = False) -> pd.DataFrame:
         """
@@ -132,7 +193,7 @@ class PostgresqlConnector:
 
         Args:
             query: SQL query to execute.
-            params: Parameters for the SQL query
+            params: Parameters for the SQL query, a tuple for %s or a dict for %(name)s placeholders
             get_result: If True, fetch and return rows (empty if none).
             commit: If True, commit the transaction after execution.
 
@@ -167,9 +228,14 @@ class PostgresqlConnector:
         - Commit has no effect
         """
 
-        # 1. Open a new PostgreSQL database connection.
+        # 1. Borrow a connection from the pool (reused across queries, no new TCP/TLS handshake).
+        # The connection context manager still commits on success and rolls back on error,
+        # so the connection goes back to the pool without an open transaction.
+        conn = None
         try:
-            with PostgresqlConnector.get_connection(PostgresqlConnector.load_db_config(self.credential_name)) as conn:
+            pool = self._get_pool()
+            conn = pool.getconn()
+            with conn:
 
                 # 1.1. Create a cursor for executing SQL
                 with conn.cursor() as cur:
@@ -190,8 +256,8 @@ class PostgresqlConnector:
                         rows = cur.fetchall()
                         col_names = [desc[0] for desc in cur.description]
 
-                        lg.info(f"Returned {len(rows)} rows.")
-                        lg.info(f"The column names: {col_names}")
+                        lg.info("Returned %s rows.", len(rows))
+                        lg.info("The column names: %s", col_names)
 
                         return pd.DataFrame(rows, columns=col_names)
 
@@ -207,6 +273,51 @@ class PostgresqlConnector:
             lg.info("Unexpected error while executing query")
             raise
 
+        finally:
+            # Return the connection to the pool; broken connections are discarded
+            if conn is not None:
+                pool.putconn(conn, close=bool(conn.closed))
+
+    def iter_query(self,
+                   query: str,
+                   params: Optional[Union[Tuple[Any, ...], Dict[str, Any]]] = None,
+                   batch_size: int = 10_000) -> Iterator[pd.DataFrame]:
+        """
+        Execute a SELECT and yield the result as DataFrames of at most batch_size rows.
+        Unlike run_query, the rows are read through a server-side (named) cursor,
+        so only one batch is held in memory at a time.
+
+        Args:
+            query: SQL query to execute.
+            params: Parameters for the SQL query, a tuple for %s or a dict for %(name)s placeholders
+            batch_size: Number of rows fetched per round trip and per yielded DataFrame.
+
+        Returns: An iterator of DataFrames; nothing is yielded when the query returns no rows.
+        """
+
+        # 1. Borrow a connection from the pool; the named cursor lives inside its transaction
+        with self._pooled_connection() as conn, conn:
+            with conn.cursor(name="iter_query") as cur:
+                cur.itersize = batch_size
+                cur.execute(query, params)
+
+                # 2. Fetch and yield the rows batch by batch
+                col_names = None
+                total_rows = 0
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+
+                    # The description of a named cursor is only available after the first fetch
+                    if col_names is None:
+                        col_names = [desc[0] for desc in cur.description]
+
+                    total_rows += len(rows)
+                    yield pd.DataFrame(rows, columns=col_names)
+
+        lg.info("Returned %s rows in batches of %s.", total_rows, batch_size)
+
     # ---------------------------------------------------------
     # DDL HELPERS
     # ---------------------------------------------------------
@@ -243,12 +354,92 @@ class PostgresqlConnector:
         # lg.info(f"Creating table if not exists: {schema}.{table}")
         self.run_query(query=query, commit=True)
 
+    def table_exists(self, schema: str, table: str) -> bool:
+        """
+        Check if <schema>.<table> exists with a single catalog lookup.
+
+        Args:
+            schema: Name of the schema
+            table: Name of the table
+
+        Returns:
+            True if the table exists, otherwise False.
+        """
+
+        # to_regclass returns NULL (instead of raising an error) when the relation does not exist
+        df = self.run_query(query="SELECT to_regclass(%s)", params=(f"{schema}.{table}",), commit=False, get_result=True)
+        return df.iat[0, 0] is not None
+
+    def run_ddl_batch(self, statements: List[str]) -> None:
+        """
+        Run several idempotent DDL statements (e.g. CREATE SCHEMA/TABLE IF NOT EXISTS) in a single
+        round trip and a single transaction: either all of them are applied or none.
+
+        Args:
+            statements: The SQL statements, with or without a trailing semicolon.
+        """
+
+        # 1. Join the statements into one multi-statement string (sent as one simple-query message)
+        query = ";\n".join(statement.strip().rstrip(";") for statement in statements if statement.strip())
+
+        # 2. Execute and commit
+        lg.info("Running a batch of %s DDL statements", len(statements))
+        self.run_query(query=query, commit=True, get_result=False)
+
     def init_schema_and_table(self, query: str, schema: str, table: str) -> None:
-        # 1. Create schema
-        self.create_schema(schema=schema)
+        # 1. Create schema and table (parametrize the query from sql_queries.py) in one round trip
+        self.run_ddl_batch(statements=[f"CREATE SCHEMA IF NOT EXISTS {schema}",
+                                       query.format(schema=schema, table=table)])
+
+    # ---------------------------------------------------------
+    # MULTI-ROW INSERTS (SMALL LOADS)
+    # ---------------------------------------------------------
+    # Rows are never inserted with cursor.executemany (one round trip per row): small loads go through
+    # execute_values, bulk loads through COPY (see upload_to_pg).
+    @staticmethod
+    def _insert_rows(cur: Any,
+                     table: str,
+                     columns: Sequence[str],
+                     rows: Iterable[Sequence[Any]],
+                     page_size: int = 10_000) -> None:
+        """
+        Insert rows with multi-row INSERT statements of up to page_size rows each, on an existing cursor.
+
+        Args:
+            cur: A cursor of the connection (and transaction) to insert with.
+            table: Target table (e.g. '<schema>.<table>' or a temporary table).
+            columns: Names of the columns the row values map to.
+            rows: The row values, any iterable (e.g. a generator); it is consumed page by page.
+            page_size: Number of rows packed into one INSERT statement.
+        """
+        execute_values(cur,
+                       f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s",
+                       rows,
+                       page_size=page_size)
+
+    # ---------------------------------------------------------
+    # SESSION TUNING (BULK LOADS)
+    # ---------------------------------------------------------
+    @staticmethod
+    def _prepare_bulk_session(cur: Any, session_settings: Optional[Dict[str, str]] = None) -> None:
+        """
+        Apply settings (e.g. synchronous_commit, work_mem) to the transaction of a bulk load.
+        The values are transaction-local (SET LOCAL), so they end with the load and are not
+        carried over to the next user of the pooled connection.
+
+        Args:
+            cur: A cursor of the upload connection.
+            session_settings: A dictionary of setting names and values, e.g. {'work_mem': '256MB'}.
+        """
 
-        # 2. Create table (parametrize the query from sql_queries.py)
-        self.create_table(query=query.format(schema=schema, table=table))
+        # 1. Nothing to apply
+        if not session_settings:
+            return
+
+        # 2. set_config(name, value, is_local=true) applies the value until the end of the transaction
+        for name, value in session_settings.items():
+            lg.info("Setting %s = %s for the upload transaction", name, value)
+            cur.execute("SELECT set_config(%s, %s, true)", (name, value))
 
     # ---------------------------------------------------------
     # UPLOAD TO DB (using a TEMPORARY TABLE + MERGE INTO LOGIC)
@@ -260,12 +451,16 @@ class PostgresqlConnector:
                     on_clause: str = '',
                     update_clause: str = '',
                     insert_columns: str = '',
-                    insert_values: str = '') -> None:
+                    insert_values: str = '',
+                    num_of_records: Optional[int] = None,
+                    copy_row_threshold: int = 0,
+                    page_size: int = 10_000,
+                    session_settings: Optional[Dict[str, str]] = None) -> None:
         """
         Upload a CSV to PostgreSQL by:
 
         1. Creating a temporary table (temp_<table>).
-        2. Loading the CSV into the temporary table.
+        2. Loading the CSV into the temporary table (COPY, or multi-row INSERTs for small files).
         3. MERGE INTO target table for updates/inserts.
         4. DROP the temporary table.
 
@@ -277,52 +472,76 @@ class PostgresqlConnector:
             update_clause: SQL SET clause for updates (non-unique attributes)
             insert_columns: Columns for INSERT (list all attributes)
             insert_values: Values for INSERT (list all attributes coming from the source)
+            num_of_records: Number of data rows in the CSV, if known.
+            copy_row_threshold: Files with fewer rows than this are loaded with execute_values instead of COPY.
+            page_size: Number of rows packed into one INSERT statement by execute_values.
+            session_settings: Settings applied to the upload transaction (see _prepare_bulk_session).
         """
 
-        # 1. Open a database connection (the temporary table will live in this session)
-        with PostgresqlConnector.get_connection(PostgresqlConnector.load_db_config(self.credential_name)) as conn:
+        # 1. Borrow a pooled connection (the temporary table will live in this transaction).
+        # The settings are transaction-local and the temporary table is dropped (or rolled back),
+        # so the connection goes back to the pool clean
+        with self._pooled_connection() as conn, conn:
             with conn.cursor() as cur:
 
+                # 1.1. Tune the transaction for the bulk load
+                PostgresqlConnector._prepare_bulk_session(cur=cur, session_settings=session_settings)
+
                 # 2. Create a temporary table
                 temp_table = f"temp_{table}"
-                lg.info(f"Temporary table: {temp_table}")
+                lg.info("Temporary table: %s", temp_table)
 
                 create_temp_query = f"""
                 CREATE TEMP TABLE {temp_table} 
                 (LIKE {schema}.{table} INCLUDING CONSTRAINTS INCLUDING INDEXES INCLUDING DEFAULTS); 
                 """
 
-                lg.info(f"Executing create temporary query: {create_temp_query}")
+                lg.info("Executing create temporary query: %s", create_temp_query)
                 cur.execute(create_temp_query)
 
-                # 3. Read the CSV (Pandas automatically detects the columns from the header row)
-                df = pd.read_csv(file_path, sep=';')
-
-                # 4. Get the columns that actually exist in the CSV
-                df_columns = df.columns.tolist()
-                lg.info(f"The dataframe columns: {df_columns}")
-
-                # 5. Use an in-memory buffer to stream the data to Postgres
-                # This is much faster than running individual INSERT statements
-                buffer = io.StringIO()
-                df.to_csv(buffer,
-                          index=False,
-                          header=False,
-                          sep=';',
-                          quoting=csv.QUOTE_NONE,
-                          escapechar='\\')
-                buffer.seek(0)  # Go back to the start of the virtual file
-
-                # 6. Execute the copy
-                lg.info(f"Loading {len(df)} rows into {temp_table}...")
-                try:
-                    cur.copy_from(buffer, temp_table, sep=';', columns=df_columns)
-                    lg.info("Load successful.")
-                except Exception as e:
-                    lg.error(f"Failed to load CSV via Pandas buffer: {e}")
-                    raise
-
-                # 7. MERGE INTO target table
+                # 3. Stream the CSV file straight into the temporary table
+                # The file is already in COPY text format (';' separated, '\\' escaped, no quoting),
+                # so there is no need to parse it with pandas and serialize it again
+                # .gz files are decompressed on the fly while streaming
+                # The file is read as UTF-8 bytes through a 1 MB buffer: psycopg2 sends the bytes as they are,
+                # without decoding them to str and encoding them back
+                buffer_size = PostgresqlConnector._copy_buffer_size
+                if file_path.endswith('.gz'):
+                    f = io.BufferedReader(gzip.open(file_path, 'rb'), buffer_size=buffer_size)
+                else:
+                    f = open(file_path, 'rb', buffering=buffer_size)
+
+                with f:
+
+                    # 4. The header row holds the columns that actually exist in the CSV
+                    csv_columns = f.readline().decode('utf-8').rstrip('\r\n').split(';')
+                    lg.info("The CSV columns: %s", csv_columns)
+
+                    # 5. Load from the current position of the file (the first data row)
+                    # Empty fields are NULLs (pandas writes missing values as empty strings)
+                    lg.info("Loading %s into %s...", file_path, temp_table)
+                    try:
+                        # 5.1. Small files: COPY has a fixed setup cost, pack the rows into multi-row INSERTs instead
+                        if num_of_records is not None and num_of_records < copy_row_threshold:
+                            text = io.TextIOWrapper(f, encoding='utf-8', newline='')
+                            rows = ([None if value == '' else value for value in row]
+                                    for row in csv.reader(text, delimiter=';', quoting=csv.QUOTE_NONE, escapechar='\\'))
+                            PostgresqlConnector._insert_rows(cur=cur,
+                                                             table=temp_table,
+                                                             columns=csv_columns,
+                                                             rows=rows,
+                                                             page_size=page_size)
+                            lg.info("Load successful. Inserted %s rows.", num_of_records)
+
+                        # 5.2. Otherwise, stream the file with COPY
+                        else:
+                            cur.copy_from(f, temp_table, sep=';', null='', columns=csv_columns, size=buffer_size)
+                            lg.info("Load successful. Loaded %s rows.", cur.rowcount)
+                    except Exception as e:
+                        lg.error("Failed to load CSV into %s: %s", temp_table, e)
+                        raise
+
+                # 6. MERGE INTO target table
                 merge_query = f"""
                     MERGE INTO {schema}.{table} AS t
                     USING {temp_table} AS s
@@ -336,10 +555,10 @@ class PostgresqlConnector:
                 lg.info("Merging temp table into target table.")
                 cur.execute(merge_query)
 
-                # 8. Explicitly drop the temporary table
-                lg.info(f"Dropping temporary table {temp_table}")
+                # 7. Explicitly drop the temporary table
+                lg.info("Dropping temporary table %s", temp_table)
                 drop_query = f"DROP TABLE {temp_table}"
                 cur.execute(drop_query)
 
-            # 9. Commit once at the end
+            # 8. Commit once at the end
             conn.commit()
\ No newline at end of file
@@ -1,15 +1,12 @@
 # import libraries
-from functools import partial
+from functools import partial, cached_property
 from typing import Any, List, Dict
 
 # import custom libraries
-# import script_factory.settings as settings
 from utilities.etl_utils import EtlUtils
 from utilities.etl_audit_manager import EtlAuditManager
-from utilities.email_manager import EmailManager
 from utilities.file_utils import build_output_file_path
 import utilities.logging_manager as lg
-from utilities.argument_parser import parse_arguments
 
 from custom_code.script_worker import ScriptWorker
 from custom_code.sql_queries import sql_queries
@@ -65,45 +62,30 @@ class ScriptFactory:
         self.settings = settings
         self.environment = settings.environment
 
-        # 3. Load environment specific parameters
-        if self.environment == 'production':
-            self.database = settings.prod_database
-            self.schema = settings.prod_schema
-            self.table = settings.prod_table
+        # 3. Load environment specific parameters (resolved once in script_parameters.py)
+        self.cfg = settings.cfg
 
-            self.delete_log = settings.prod_delete_log
-            self.log_retention_number = settings.prod_log_retention_number
-            self.log_mode = settings.prod_log_mode
+        self.database = self.cfg.database
+        self.schema = self.cfg.schema
+        self.table = self.cfg.table
 
-            self.delete_output = settings.prod_delete_output
+        self.delete_log = self.cfg.delete_log
+        self.log_retention_number = self.cfg.log_retention_number
+        self.log_mode = self.cfg.log_mode
 
-            self.list_recipients_admin = settings.prod_list_recipients_admin
-            self.list_recipients_business = settings.prod_list_recipients_business
-            self.list_recipients_error = settings.prod_list_recipients_error
+        self.delete_output = self.cfg.delete_output
 
-            self.is_admin_email_enabled = settings.prod_is_admin_email_alert_enabled
-            self.is_business_email_enabled = settings.prod_is_business_email_alert_enabled
-            self.is_error_email_enabled = settings.prod_is_error_email_alert_enabled
-        else:
-            self.database = settings.dev_database
-            self.schema = settings.dev_schema
-            self.table = settings.dev_table
+        self.list_recipients_admin = self.cfg.list_recipients_admin
+        self.list_recipients_business = self.cfg.list_recipients_business
+        self.list_recipients_error = self.cfg.list_recipients_error
 
-            self.delete_log = settings.dev_delete_log
-            self.log_retention_number = settings.dev_log_retention_number
-            self.log_mode = settings.dev_log_mode
-
-            self.delete_output = settings.dev_delete_output
-
-            self.list_recipients_admin = settings.dev_list_recipients_admin
-            self.list_recipients_business = settings.dev_list_recipients_business
-            self.list_recipients_error = settings.dev_list_recipients_error
-
-            self.is_admin_email_enabled = settings.dev_is_admin_email_alert_enabled
-            self.is_business_email_enabled = settings.dev_is_business_email_alert_enabled
-            self.is_error_email_enabled = settings.dev_is_error_email_alert_enabled
+        self.is_admin_email_enabled = self.cfg.is_admin_email_enabled
+        self.is_business_email_enabled = self.cfg.is_business_email_enabled
+        self.is_error_email_enabled = self.cfg.is_error_email_enabled
 
         # 4. Initialize components
+        # The source connector is created once and shared with the ScriptWorker
+        self.source_connector = PostgresqlConnector(credential_name=settings.source_credential_name)
         self.etl_utils = EtlUtils(self)
         self.script_worker = ScriptWorker(self)
         self.etl_audit_manager = EtlAuditManager(self, self.script_worker, self.database)
@@ -111,19 +93,33 @@ class ScriptFactory:
         # Create an instance of the connector
         self.pg_connector = PostgresqlConnector(credential_name=self.database)
 
-        # 5. Create schema and table
-        self.pg_connector.init_schema_and_table(query=sql_queries['create_table'],
-                                                schema=self.schema,
-                                                table=self.table)
+        # 5. Pre-render the SQL that only depends on schema/table, so the task builders don't re-format it
+        self._set_comments_sql = sql_queries['set_comments'].format(schema=self.schema, table=self.table)
+        self._prev_max_date_sql = sql_queries['prev_max_date_query'].format(schema=self.schema, table=self.table)
 
-        # 6. Build file path for the output folder
-        self.file_path = build_output_file_path(table=self.table)
-        lg.info(f"The file will be saved to: {self.file_path}")
+        # 6. Create schema and table in one round trip (skip the DDL when the table already exists)
+        if not self.pg_connector.table_exists(schema=self.schema, table=self.table):
+            self.pg_connector.init_schema_and_table(query=sql_queries['create_table'],
+                                                    schema=self.schema,
+                                                    table=self.table)
 
+        # 7. Settings for the upload transaction (applied with SET LOCAL)
+        self._bulk_session_settings = {
+            'work_mem'              : f"{settings.work_mem_mb}MB",
+            'maintenance_work_mem'  : f"{settings.maintenance_work_mem_mb}MB"
+        }
+        if settings.synchronous_commit_off_during_copy:
+            self._bulk_session_settings['synchronous_commit'] = 'off'
 
-    def init_tasks(self) -> List[Dict[str, Any]]:
+        # 8. Build file path for the output folder
+        self.file_path = build_output_file_path(table=self.table, compress=settings.compress_csv)
+        lg.info("The file will be saved to: %s", self.file_path)
+
+
+    @cached_property
+    def tasks(self) -> List[Dict[str, Any]]:
         """
-        Initialize a list of parametrized tasks.
+        Initialize a list of parametrized tasks. The list is built on first access and reused afterwards.
 
         Returns:
              A list of ETL tasks to be executed for this project.
@@ -138,8 +134,7 @@ class ScriptFactory:
                                       target_database='datastore',
                                       target_table=f'{self.schema}.{self.table}',
                                       forced_sdt=self.forced_sdt,
-                                      prev_max_date_query=sql_queries['prev_max_date_query'].format(schema=self.schema,
-                                                                                                    table=self.table)
+                                      prev_max_date_query=self._prev_max_date_sql
                             ),
             "task_name"     : "insert_etl_runs_record",
             "description"   : "Insert an audit record for the current execution of the project.",
@@ -150,7 +145,7 @@ class ScriptFactory:
 
         task_2 = {
             "function"      : partial(self.pg_connector.run_query,
-                                      query=sql_queries['set_comments'].format(schema=self.schema, table=self.table),
+                                      query=self._set_comments_sql,
                                       commit=True,
                                       get_result=True
                                       ),
@@ -168,7 +163,8 @@ class ScriptFactory:
             "description"   : "Extract the data from the source system.",
             "is_enabled"    : True,
             "retries"       : 0,
-            "depends_on"    : "set_comments"
+            # Only needs the load window (sdt/edt) of the audit record, so it runs alongside set_comments
+            "depends_on"    : "insert_etl_runs_record"
         }
 
         task_4 = {
@@ -182,13 +178,18 @@ class ScriptFactory:
                                       on_clause=sql_queries['on_clause'],
                                       update_clause=sql_queries['update_clause'],
                                       insert_columns=sql_queries['insert_columns'],
-                                      insert_values=sql_queries['insert_values']
+                                      insert_values=sql_queries['insert_values'],
+                                      copy_row_threshold=self.settings.copy_row_threshold,
+                                      page_size=self.settings.execute_values_page_size,
+                                      session_settings=self._bulk_session_settings
                             ),
             "task_name"    : "upload_to_pg",
             "description"  : "Load the data into the data warehouse.",
             "is_enabled"   : True,
             "retries"      : 0,
-            "depends_on"   : "get_data"
+            # The MERGE waits for the COMMENT statements too: a failed set_comments stops the load,
+            # and the table locks of the two tasks never queue behind each other
+            "depends_on"   : ["get_data", "set_comments"]
         }
 
         task_5 = {
@@ -13,6 +13,7 @@
 """
 
 import os
+from dataclasses import dataclass
 
 # ===========================================================
 # 1. Script metadata
@@ -140,6 +141,29 @@ max_days_to_load = 30
 
 # 6.3 Source for the project
 sources = ['financial_data.ethereum']
+source_credential_name = 'postgresql: development'
+
+# 6.4 Number of rows pandas formats per chunk when writing the output CSV
+csv_chunk_size = 100_000
+
+# 6.5 Loads with fewer rows than copy_row_threshold use multi-row INSERTs (execute_values) instead of COPY
+copy_row_threshold = 1_000
+execute_values_page_size = 10_000
+
+# 6.6 Write the output CSV gzip-compressed (.csv.gz): trades CPU on both the write and the COPY for disk space,
+# so only worth enabling when the output folder is short on disk or on a slow network mount
+compress_csv = False
+
+# 6.7 Session settings for the upload connection
+synchronous_commit_off_during_copy = True
+work_mem_mb = 256
+maintenance_work_mem_mb = 1024
+
+# 6.8 Maximum number of independent tasks executed concurrently by the script runner
+max_parallel_tasks = 4
+
+# 6.9 Number of source rows fetched, transformed and written per batch by get_data (bounds the extract memory)
+extract_batch_size = 100_000
 
 # ===========================================================
 # 7. Project options (PROD and DEV)
@@ -158,4 +182,67 @@ dev_log_retention_number = 5
 dev_log_mode = 'N'
 
 dev_delete_output = True
-####################################################################
\ No newline at end of file
+####################################################################
+
+# ===========================================================
+# 8. Environment settings (resolved once for the run environment)
+# ===========================================================
+
+@dataclass(frozen=True, slots=True)
+class EnvSettings:
+    database: str
+    schema: str
+    table: str
+    delete_log: bool
+    log_retention_number: int
+    log_mode: str
+    delete_output: bool
+    list_recipients_admin: list
+    list_recipients_business: list
+    list_recipients_error: list
+    is_admin_email_enabled: bool
+    is_business_email_enabled: bool
+    is_error_email_enabled: bool
+
+
+prod_settings = EnvSettings(
+    database                    = prod_database,
+    schema                      = prod_schema,
+    table                       = prod_table,
+    delete_log                  = prod_delete_log,
+    log_retention_number        = prod_log_retention_number,
+    log_mode                    = prod_log_mode,
+    delete_output               = prod_delete_output,
+    list_recipients_admin       = prod_list_recipients_admin,
+    list_recipients_business    = prod_list_recipients_business,
+    list_recipients_error       = prod_list_recipients_error,
+    is_admin_email_enabled      = prod_is_admin_email_alert_enabled,
+    is_business_email_enabled   = prod_is_business_email_alert_enabled,
+    is_error_email_enabled      = prod_is_error_email_alert_enabled
+)
+
+dev_settings = EnvSettings(
+    database                    = dev_database,
+    schema                      = dev_schema,
+    table                       = dev_table,
+    delete_log                  = dev_delete_log,
+    log_retention_number        = dev_log_retention_number,
+    log_mode                    = dev_log_mode,
+    delete_output               = dev_delete_output,
+    list_recipients_admin       = dev_list_recipients_admin,
+    list_recipients_business    = dev_list_recipients_business,
+    list_recipients_error       = dev_list_recipients_error,
+    is_admin_email_enabled      = dev_is_admin_email_alert_enabled,
+    is_business_email_enabled   = dev_is_business_email_alert_enabled,
+    is_error_email_enabled      = dev_is_error_email_alert_enabled
+)
+
+# Settings per run environment (add an entry to support a new environment);
+# any environment without an entry uses the development settings
+env_settings = {
+    'production'    : prod_settings,
+    'development'   : dev_settings,
+}
+
+# Settings for the current run environment
+cfg = env_settings.get(environment, dev_settings)
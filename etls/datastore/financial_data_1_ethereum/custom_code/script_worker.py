@@ -1,12 +1,11 @@
 # Import libraries
 import csv, os
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 
 # Import custom libraries
 import utilities.logging_manager as lg
-from utilities.etl_utils import EtlUtils
-from connectors.postgresql_connector import PostgresqlConnector
-from custom_code.sql_queries import sql_queries, source_columns_unique
+from custom_code.sql_queries import sql_queries
 
 
 class ScriptWorker:
@@ -33,87 +32,136 @@ class ScriptWorker:
     def get_data(self, file_path: str) -> None:
         """
         1. Create a DB/API connection using the .cfg credentials to make a connection.
-        2. Run SQL queries or API calls to fetch raw data.
-        2. Apply custom business logic transformations.
-        3. Save transformed data to CSV/Parquet for DB upload.
+        2. Run SQL queries or API calls to fetch raw data, in batches of settings.extract_batch_size rows.
+        2. Apply custom business logic transformations to each batch.
+        3. Append each transformed batch to the CSV/Parquet file for DB upload,
+        so only one batch is held in memory at a time.
         """
 
-        # 1. Initialize the Postgres connector
-        pg_connector = PostgresqlConnector(credential_name='postgresql: development')
-
-        # 2. Format the query
-        query = sql_queries['get_data'].format(
-                            sdt=self.sfc.etl_audit_manager.sdt.strftime('%Y-%m-%d %H:%M:%S.%f%z'),
-                            edt=self.sfc.etl_audit_manager.edt.strftime('%Y-%m-%d %H:%M:%S.%f%z'))
-
-        lg.info(f"The query: {query}")
-
-        # 3. Run the query and assign the result to a dataframe
-        df = pg_connector.run_query(query=query, commit=False, get_result=True)
-
-        # 4. If there is data, apply transformations
-        if len(df) > 0:
-
-            # 4.1. Take the etl_runs_key from the audit table and add it to the dataframe
-            df['etl_runs_key'] = self.sfc.etl_audit_manager.etl_runs_key
-
-            # 4.2. Process and transform the DataFrame
-            df = self.sfc.etl_utils.transform_dataframe(
-                                    df=df,
-                                    # Pass source columns in lowercase
-                                    columns_str_dict={'tx_hash'             : 'tax_hash',
-                                                      'blck_nbr_raw_val'    : 'raw_number_value',
-                                                      'eth_amt_001'         : 'ethereum_amount',
-                                                      'contract_addr_x'     : 'contract_address',
-                                                      'f_is_vld_bool'       : 'is_valid'},
-                                    columns_lowercase=True,
-                                    columns_strip_list=['sender_address'],
-                                    columns_replace_backslash_list=['input_data'],
-                                    columns_escape_backslash_list=[],
-                                    columns_sanitize_list=['dirty_text'],
-                                    columns_date_config_dict={'event_date': '%Y-%m-%d'},
-                                    columns_int_list=['raw_number_value', 'transaction_index', 'raw_id_str'],
-                                    columns_numeric_list=['raw_value_float'],
-                                    columns_json_list=['metadata'],
-                                    columns_non_null_list=[],  # 'required_field'
-                                    columns_unique_list=[]     # 'unique_key_test'
-                                    )
-
-            # 4.3. Process the date ranges
-            self.data_min_date, self.data_max_date = self.sfc.etl_utils.process_dataframe_date_ranges(
-                df=df,
-                date_columns=['source_created_at', 'source_updated_at'])
-
-            lg.info(f"The Script Worker data_min_date: {self.data_min_date}")
-            lg.info(f"The Script Worker data_max_date: {self.data_max_date}")
-
-            # 4.4. If there are no time columns in the source, we can set data_min/max_dates manually to sdt and edt
-            # self.sfc.etl_audit_manager.data_min_date = self.sfc.etl_audit_manager.sdt
-            # self.sfc.etl_audit_manager.data_max_date = self.sfc.etl_audit_manager.edt
-
-            # 4.5. This will be passed to update_etl_runs_table_record
-            self.num_of_records = len(df)
-            lg.info(f"The number of records: {self.num_of_records}")
-
-            # 4.6. Write to CSV
-            df.to_csv(
-                    path_or_buf=file_path,
-                    sep=";",
-                    encoding="utf-8",
-                    index=False,
-                    escapechar="\\",
-                    doublequote=False,
-                    quoting=csv.QUOTE_NONE,
-                    header=True
-            )
+        # 1. Use the source connector created once by the ScriptFactory
+        pg_connector = self.sfc.source_connector
+
+        # 2. Bind the load window as query parameters: the query text stays constant between runs
+        # and the datetimes are sent as-is instead of being formatted into strings
+        query = sql_queries['get_data']
+        params = {'sdt': self.sfc.etl_audit_manager.sdt,
+                  'edt': self.sfc.etl_audit_manager.edt}
+
+        lg.info("The query: %s", query)
+        lg.info("The query parameters: %s", params)
+
+        # Reset the counters, so a retried task does not add to the previous attempt
+        self.num_of_records = 0
+        self.data_min_date = None
+        self.data_max_date = None
+
+        # 3. Run the query and process the result batch by batch
+        batches = pg_connector.iter_query(query=query,
+                                          params=params,
+                                          batch_size=self.sfc.settings.extract_batch_size)
+
+        # A single writer thread keeps the CSV writes ordered.
+        # closing() stops the generator on an error, so its server-side cursor is closed
+        # and the pooled connection is returned right away
+        with closing(batches), ThreadPoolExecutor(max_workers=1) as writer:
+            pending_write = None
+            for df in batches:
+
+                # 4.1. Take the etl_runs_key from the audit table and add it to the dataframe
+                df['etl_runs_key'] = self.sfc.etl_audit_manager.etl_runs_key
+
+                # 4.2. Process and transform the DataFrame
+                # Duplicates are only detected within a batch; the MERGE on the unique columns handles the rest
+                df = self.sfc.etl_utils.transform_dataframe(
+                                        df=df,
+                                        # Pass source columns in lowercase
+                                        columns_str_dict={'tx_hash'             : 'tax_hash',
+                                                          'blck_nbr_raw_val'    : 'raw_number_value',
+                                                          'eth_amt_001'         : 'ethereum_amount',
+                                                          'contract_addr_x'     : 'contract_address',
+                                                          'f_is_vld_bool'       : 'is_valid'},
+                                        columns_lowercase=True,
+                                        columns_strip_list=['sender_address'],
+                                        columns_replace_backslash_list=['input_data'],
+                                        columns_escape_backslash_list=[],
+                                        columns_sanitize_list=['dirty_text'],
+                                        columns_date_config_dict={'event_date': '%Y-%m-%d'},
+                                        columns_int_list=['raw_number_value', 'transaction_index', 'raw_id_str'],
+                                        columns_numeric_list=['raw_value_float'],
+                                        columns_json_list=['metadata'],
+                                        columns_non_null_list=[],  # 'required_field'
+                                        columns_unique_list=[]     # 'unique_key_test'
+                                        )
+
+                # 4.3. Process the date ranges of the batch and fold them into the run's min and max dates
+                # (the clamping to sdt/edt commutes with min/max, so the result equals a single pass)
+                batch_min_date, batch_max_date = self.sfc.etl_utils.process_dataframe_date_ranges(
+                    df=df,
+                    date_columns=['source_created_at', 'source_updated_at'])
+
+                if self.data_min_date is None:
+                    self.data_min_date, self.data_max_date = batch_min_date, batch_max_date
+                else:
+                    self.data_min_date = min(self.data_min_date, batch_min_date)
+                    self.data_max_date = max(self.data_max_date, batch_max_date)
+
+                # 4.4. If there are no time columns in the source, we can set data_min/max_dates manually to sdt and edt
+                # self.sfc.etl_audit_manager.data_min_date = self.sfc.etl_audit_manager.sdt
+                # self.sfc.etl_audit_manager.data_max_date = self.sfc.etl_audit_manager.edt
+
+                # 4.5. Write to CSV: the first batch creates the file with the header, the next ones are appended.
+                # The write runs on the writer thread while the next batch is fetched and transformed;
+                # waiting for the previous write first keeps the batches in order and at most two in memory
+                is_first_batch = self.num_of_records == 0
+                if pending_write is not None:
+                    pending_write.result()
+                pending_write = writer.submit(self._write_batch, df=df, file_path=file_path, is_first_batch=is_first_batch)
+
+                # 4.6. This will be passed to update_etl_runs_table_record
+                self.num_of_records += len(df)
+
+            # 4.7. Wait for the last write (re-raises its error, if any)
+            if pending_write is not None:
+                pending_write.result()
+
+        if self.num_of_records > 0:
+            lg.info("The Script Worker data_min_date: %s", self.data_min_date)
+            lg.info("The Script Worker data_max_date: %s", self.data_max_date)
+            lg.info("The number of records: %s", self.num_of_records)
 
         else:
-            # 4.7. No records are returned, then leave the min and max dates at the start date
+            # 4.8. No records are returned, then leave the min and max dates at the start date
             # The next run will start from the same point
-            self.num_of_records = 0
             self.sfc.etl_audit_manager.data_min_date = self.sfc.etl_audit_manager.sdt
             self.sfc.etl_audit_manager.data_max_date = self.sfc.etl_audit_manager.sdt
 
+    def _write_batch(self, df, file_path: str, is_first_batch: bool) -> None:
+        """
+        Write one transformed batch to the output CSV: the first batch creates the file with the header,
+        the next ones are appended. With a .gz path, each batch becomes a gzip member of the file.
+
+        Args:
+            df: The transformed batch.
+            file_path: The output file path.
+            is_first_batch: True for the first batch of the run.
+        """
+
+        # pandas formats the rows in C, chunk by chunk; bigger chunks mean fewer Python-level round trips
+        df.to_csv(
+                path_or_buf=file_path,
+                mode="w" if is_first_batch else "a",
+                sep=";",
+                encoding="utf-8",
+                index=False,
+                escapechar="\\",
+                doublequote=False,
+                quoting=csv.QUOTE_NONE,
+                header=is_first_batch,
+                chunksize=self.sfc.settings.csv_chunk_size,
+                # Fast gzip (level 1) when the output file is compressed
+                compression={'method': 'gzip', 'compresslevel': 1} if file_path.endswith('.gz') else None
+        )
+
     # 5. Upload to DWH
     def upload_to_dwh(self,
                       database_connector,
@@ -125,7 +173,10 @@ class ScriptWorker:
                       on_clause,
                       update_clause,
                       insert_columns,
-                      insert_values) -> None:
+                      insert_values,
+                      copy_row_threshold: int = 0,
+                      page_size: int = 10_000,
+                      session_settings: dict = None) -> None:
         """
         1. Try to load data using the upload_to_pg function from the postgresql_connector Class
         2. If the upload is ok, set the status of the run to 'Complete'
@@ -144,11 +195,14 @@ class ScriptWorker:
         insert_columns: A parameter of upload_to_pg from PostgresConnector
         insert_values: A parameter of upload_to_pg from PostgresConnector
         delete_output: A boolean specifying whether we should delete the file after each run.
+        copy_row_threshold: A parameter of upload_to_pg from PostgresConnector
+        page_size: A parameter of upload_to_pg from PostgresConnector
+        session_settings: A parameter of upload_to_pg from PostgresConnector
         """
 
         # 1. Check if the file exists
         if not os.path.exists(file_path):
-            lg.info(f"No data to upload for {table}. Skipping upload step.")
+            lg.info("No data to upload for %s. Skipping upload step.", table)
 
             # Mark run as complete
             self.status = 'Complete'
@@ -165,20 +219,24 @@ class ScriptWorker:
                                             on_clause=on_clause,
                                             update_clause=update_clause,
                                             insert_columns=insert_columns,
-                                            insert_values=insert_values)
+                                            insert_values=insert_values,
+                                            num_of_records=self.num_of_records,
+                                            copy_row_threshold=copy_row_threshold,
+                                            page_size=page_size,
+                                            session_settings=session_settings)
 
             # 3. If the upload is ok, set the status of the run to 'Complete'
             self.status = 'Complete'
         except Exception as e:
             # 4. If the upload isn't ok, set the status of the run to 'Error'
             self.status = 'Error'
-            lg.error(f"Upload did not go through. Error: {e}.")
+            lg.error("Upload did not go through. Error: %s.", e)
 
             # 5. Try to run the update_etl_runs_table_record function
             try:
                 etl_audit_manager.update_etl_runs_table_record(status=self.status)
             except Exception as ex:
-                lg.error(f"Update did not go through. Error: {ex}")
+                lg.error("Update did not go through. Error: %s", ex)
             raise e
 
         # 6. This will run (deletion still happens on both success/failure of try/except above)
@@ -186,6 +244,6 @@ class ScriptWorker:
             if delete_output and os.path.exists(file_path):
                 try:
                     os.remove(path=file_path)
-                    lg.info(f"Deleted temporary file: {file_path}")
+                    lg.info("Deleted temporary file: %s", file_path)
                 except Exception as ex:
-                    lg.error(f"Could not delete file {file_path}: {ex}")
\ No newline at end of file
+                    lg.error("Could not delete file %s: %s", file_path, ex)
@@ -1,3 +1,5 @@
+import re
+
 # 1. Initialize an empty sql_queries dictionary
 sql_queries = {}
 
@@ -42,7 +44,7 @@ sql_queries['create_table'] = '''
         CREATE INDEX ON {schema}.{table}(''' + source_columns_unique + ''');
     '''
 
-# 5. Create a get_data query
+# 5. Create a get_data query (sdt and edt are bound by the driver, see ScriptWorker.get_data)
 sql_queries['get_data'] = '''
                           SELECT id, 
                                 BLCK_NBR_raw_VAL, 
@@ -65,8 +67,8 @@ sql_queries['get_data'] = '''
                                 unique_key_test,
                                 required_field
                           FROM financial_data.ethereum_data
-                          WHERE (source_created_at BETWEEN '{sdt}' AND '{edt}'
-                            OR source_updated_at BETWEEN '{sdt}' AND '{edt}');
+                          WHERE (source_created_at BETWEEN %(sdt)s AND %(edt)s
+                            OR source_updated_at BETWEEN %(sdt)s AND %(edt)s);
                           '''
 
 # 6. Create a set_comments query
@@ -102,37 +104,35 @@ sql_queries['prev_max_date_query'] = """SELECT data_max_date
 
 # 8. MERGE INTO syntax for on_clause, update_clause, insert_columns and insert_values
 
+# 8.0. Parse the column names once and reuse them for every clause below
+
+# Extract all column names from source_cols_create in a single regex pass:
+# the first identifier of each line, skipping empty lines and '--' comments
+_column_name_pattern = re.compile(r'^[ \t]*(?!--)([A-Za-z_][A-Za-z0-9_]*)', re.MULTILINE)
+source_cols_general_list = _column_name_pattern.findall(source_columns_create)
+
+# Extract the unique column names (the set is used for membership checks)
+unique_cols_list = [col.strip() for col in source_columns_unique.split(',')]
+_unique_cols_set = frozenset(unique_cols_list)
+
 # 8.1. Construct ON_CLAUSE using target (t) and source (s) UNIQUE columns
-sql_queries['on_clause'] = " AND ".join([f"t.{col.strip()} = s.{col.strip()}" for col in source_columns_unique.split(',')])
+sql_queries['on_clause'] = " AND ".join(f"t.{col} = s.{col}" for col in unique_cols_list)
 
 # 8.2. Construct the UPDATE_CLAUSE
 
-# Extract all column names from source_cols_create
-source_cols_general_list = [
-    line.split()[0]                                            # Take the first word as column name
-    for line in source_columns_create.strip().split('\n')      # Remove whitespace and split into lines
-    if line.strip() and not line.strip().startswith('--')      # Skip empty lines & comments
-]
-
 # Identify non-unique columns
-normal_cols_list = [col for col in source_cols_general_list
-    if col not in [u.strip() for u in source_columns_unique.split(',')]
-]
+normal_cols_list = [col for col in source_cols_general_list if col not in _unique_cols_set]
 
 # Assemble the update_clause
-update_parts = ["etl_runs_key = s.etl_runs_key"] + \
-               [f"{col} = s.{col}" for col in normal_cols_list] + \
-               ["modified_at = CURRENT_TIMESTAMP"]
-
-sql_queries['update_clause'] = ", ".join(update_parts)
+sql_queries['update_clause'] = (f"etl_runs_key = s.etl_runs_key, "
+                                f"{', '.join(f'{col} = s.{col}' for col in normal_cols_list)}, "
+                                f"modified_at = CURRENT_TIMESTAMP")
 
 # 8.3. Construct the INSERT_COLUMNS and INSERT_VALUES for MERGE INTO
 
-# Extract normal columns from CREATE TABLE, skip comments
-cols = [line.split()[0] for line in source_columns_create.strip().split('\n') if line.strip() and not line.strip().startswith('--')]
-
 # Add etl_runs_key, the source columns, created_at and modified_at in the column list
-sql_queries['insert_columns'] = 'etl_runs_key, ' + ', '.join(cols) + ', created_at, modified_at'
+sql_queries['insert_columns'] = f"etl_runs_key, {', '.join(source_cols_general_list)}, created_at, modified_at"
 
 # Add etl_runs_key value, the source values, and two current_timestamps (for created_at and modified_at)
-sql_queries['insert_values'] = 's.etl_runs_key, ' + ', '.join([f"s.{c}" for c in cols]) + ', current_timestamp, current_timestamp'
\ No newline at end of file
+sql_queries['insert_values'] = (f"s.etl_runs_key, {', '.join(f's.{col}' for col in source_cols_general_list)}, "
+                                f"current_timestamp, current_timestamp")
@@ -1,5 +1,6 @@
 # import libraries
 import time, sys, traceback
+from concurrent.futures import ThreadPoolExecutor
 
 # import custom libraries
 from custom_code.script_factory import ScriptFactory
@@ -7,6 +8,7 @@ import custom_code.script_parameters as settings
 import utilities.logging_manager as lg
 from utilities.argument_parser import parse_arguments
 from utilities.email_manager import EmailManager
+from utilities.orchestration_utils import run_task_graph, validate_task_graph
 
 def main():
     """
@@ -16,14 +18,15 @@ def main():
         - execute the project via run_script.py.
         - capture the start time of execution.
         - initialize an overall success flag to track final pipeline status
-        - create a success_registry set to track tasks that completed successfully and for dependency validation.
     2. Initialization:
         - read command-line arguments using parse_arguments to override internal default settings.
         - initialize the ScriptFactory class using the parsed arguments and configuration settings.
         - initialize the EmailManager class using the factory instance.
         - retrieve the list of task definitions from the factory.
+        - validate the dependency graph (unknown dependencies or cycles raise a DependencyError).
     3. Task iteration.
-        - iterate over the list of task dictionaries.
+        - run the enabled tasks as a dependency graph based on 'depends_on' in a thread pool;
+          a task is started as soon as its dependency succeeded.
         - for each task, extract the following attributes:
             - task name
             - execution function
@@ -37,8 +40,8 @@ def main():
             - add the task result and reason to the e-mail report.
             - continue the execution with the next task.
     5. Dependency check.
-        - if a task has a dependency and the dependent task is not present in the success_registry set.
-            - mark the task as skipped.
+        - if a task has a dependency that failed, was skipped or is disabled:
+            - mark the task (and the tasks depending on it) as skipped.
             - log dependency failure information and add it to the e-mail.
             - set the overall success flag to False.
             - continue execution with the next task.
@@ -48,21 +51,22 @@ def main():
         - execute the task function inside a retry loop:
             - on success:
                 - mark the task as successful
-                - add the task name to the success_registry set.
+                - start the tasks that depend on it.
                 - add the success information to the e-mail.
                 - exit the retry loop early
             - on failure:
                 - capture the exception traceback and log it.
-                - if retries remain, sleep for X seconds before trying again.
+                - if the error is a non-retryable ETLError, stop retrying.
+                - if retries remain, schedule the retry after a jittered exponential backoff (the worker thread is released meanwhile).
                 - if all retries are exhausted, mark the task as failed in the e-mail report.
     7. Log collection.
         - collect the generated logs after the task execution (successful or not)
-        - add task-specific logs to the e-mail report.
+        - add task-specific logs to the e-mail report, in definition order.
     8. Halt pipeline on failure.
         - if a task fails after all retries:
             - set the overall success flag to False.
             - log the pipeline halt message.
-            - terminate the main task loop to prevent downstream inconsistencies.
+            - let the running tasks finish, but start no new task to prevent downstream inconsistencies.
     9. Global exception handling.
         - log any unexcepted exception during pipeline execution
         - set the overall success flag to False.
@@ -78,9 +82,6 @@ def main():
 
     lg.info("Starting the ETL run")
     success = True
-    # success_registry stores the 'task_name' of every task that finished without error.
-    # This is used to validate the 'depends_on' requirements.
-    success_registry = set()
 
     # 1. Initialization
     # Parse the .bat/.sh file for input parameters
@@ -98,108 +99,62 @@ def main():
     email_manager = EmailManager(factory=factory)
 
     # Fetch the list of task dictionaries
-    tasks = factory.init_tasks()
+    tasks = factory.tasks
 
-    try:
-        for task in tasks:
-            # 2. Data extraction
-            # Match the keys exactly as defined in init_tasks() dictionaries.
+    # Split the runnable (enabled) tasks from the disabled ones once, before the main loop
+    plan = [task for task in tasks if task["is_enabled"]]
 
-            t_name = task["task_name"]                   # Name of the task
-            t_func = task["function"]                    # This is the partial() object
-            t_dep = task["depends_on"]                   # The name of the required previous task (dependency)
-            t_enabled = task["is_enabled"]               # Determines if the task is enabled or disabled
-            t_retries = task["retries"]                  # The number of retries for each task
-            t_desc = task["description"]                 # Description of the task
+    try:
+        # 2. Validate the dependency graph once (unknown dependencies, cycles) before any task runs
+        validate_task_graph(tasks)
 
-            # 3. Is enabled check.
-            # If a task is explicitly set to False, we log it and move to the next item.
-            if not t_enabled:
-                lg.info(f"Skipping task '{t_name}': Status is DISABLED")
+        # Is enabled check.
+        # Tasks explicitly set to False are logged and reported once, and never enter the main loop.
+        for task in tasks:
+            if not task["is_enabled"]:
+                lg.info("Skipping task '%s': Status is DISABLED", task["task_name"])
 
                 # include it in the e-mail as disabled
                 email_manager.add_task_result_to_email(task=task, status="DISABLED")
 
                 # include it in the log
-                email_manager.add_log_block_to_email(task_name=t_name, logs="Task is disabled in configuration.", task=task)
-
-                continue
-
-            # 4. Dependency check.
-            # If 'depends_on' is not None, we check if that task name exists in the success_registry.
-            # If the previous task failed or was skipped, this task can't run.
-            if t_dep and (t_dep not in success_registry):
-                lg.info(f"Stopping pipeline: Task '{t_name}' depends on '{t_dep}', but '{t_dep}' was not successful.")
-                error_msg = f"Dependency {t_dep} failed."
-
-                # Append a formatted HTML table row to the `internal task log` section
-                email_manager.add_task_result_to_email(task=task, status="SKIPPED", error_msg=error_msg)
-
-                # Capture the error the log created for the `technical log details` section
-                email_manager.add_log_block_to_email(task_name=t_name, logs=f"SKIPPED: {error_msg}", task=task)
-
+                email_manager.add_log_block_to_email(task_name=task["task_name"], logs="Task is disabled in configuration.", task=task)
+
+        # 3. Execution.
+        # The enabled tasks run as a dependency graph in a thread pool: a task starts as soon as its dependency succeeded.
+        # A task whose dependency failed, was skipped or is disabled does not run.
+        with ThreadPoolExecutor(max_workers=settings.max_parallel_tasks) as executor:
+            results = run_task_graph(executor=executor,
+                                     plan=plan,
+                                     collect_logs=email_manager.is_any_email_alert_enabled)
+
+        # 4. Reporting.
+        # The results are added to the e-mail in definition order.
+        for task in plan:
+            status, message, task_specific_logs = results[task["task_name"]]
+
+            if status == "SUCCESS":
+                # Add the task result to the email
+                email_manager.add_task_result_to_email(task=task, status="SUCCESS")
+
+            elif status == "FAILED":
                 success = False
-                continue
-
-            # 5. Execution and retry loop
-            # Define a boolean variable to track the success of a task
-            task_passed_finally = False
-
-            # a pointer for the start of a task
-            log_start_position = lg.get_current_log_size()
-
-            # If retries=1, the loop runs for attempt 0 (initial) and attempt 1 (retry).
-            for attempt in range(0, t_retries + 1):
-                try:
-                    if attempt > 0:
-                        lg.info(f"Retrying task '{t_name}'... (Attempt {attempt} of {t_retries})")
 
-                    lg.info(f"Executing: {t_name} - {t_desc}")
+                # Mark the task as failed
+                email_manager.add_task_result_to_email(task=task, status="FAILED", error_msg=message)
 
-                    # Trigger the partial function with all its pre-set arguments
-                    t_func()
-
-                    # If we reach this line, the function finished successfully
-                    task_passed_finally = True
-
-                    # Mark as success for future dependencies
-                    success_registry.add(t_name)
-
-                    # Add the task result to the email
-                    email_manager.add_task_result_to_email(task=task, status="SUCCESS")
-
-                    # Exit the retry loop early
-                    break
-
-                except Exception as e:
-                    lg.info(f"Attempt {attempt} failed for '{t_name}': {str(e)}")
-
-                    # If there are still retries left, wait 5 second before trying again
-                    if attempt < t_retries:
-                        lg.info("Waiting 5 seconds before next retry...")
-                        time.sleep(5)
-                    else:
-                        lg.info(f"Task '{t_name}' exhausted all retry attempts.")
-
-                        # Mark the task as failed
-                        email_manager.add_task_result_to_email(task=task, status="FAILED", error_msg="See Technical Log Details below")
+            else:
+                success = False
 
-            # Read and return the log content from a specific byte offset to the end
-            task_specific_logs = lg.get_logs_from_position(log_start_position)
+                # Append a formatted HTML table row to the `internal task log` section
+                email_manager.add_task_result_to_email(task=task, status="SKIPPED", error_msg=message)
+                task_specific_logs = f"SKIPPED: {message}"
 
             # Add the logs to the e-mail
-            email_manager.add_log_block_to_email(task_name=t_name, logs=task_specific_logs, task=task)
-
-            # 6. Pipeline halt
-            # If the task failed all retries, 'task_passed_finally' remains False.
-            # We stop the entire ETL process to prevent data corruption or inconsistent states in subsequent tasks.
-            if not task_passed_finally:
-                success = False
-                lg.info(f"Pipeline execution halted due to failure in: {t_name}")
-                break
+            email_manager.add_log_block_to_email(task_name=task["task_name"], logs=task_specific_logs, task=task)
 
     except Exception as e:
-        lg.info(f"Critical error during execution: {e}")
+        lg.info("Critical error during execution: %s", e)
         success = False
 
     finally:
@@ -214,13 +169,16 @@ def main():
         duration_formatted = time.strftime("%H:%M:%S", time.gmtime(duration_seconds))
 
         try:
-            # 8. Prepare the mails
-            email_manager.prepare_emails(script_execution_time=duration_formatted)
-
-            # 9. Send the mails
-            email_manager.send_emails(is_error=not success)
+            # 8. Prepare the mails, unless no recipient group receives an e-mail for this outcome
+            if email_manager.is_email_alert_enabled(is_error=not success):
+                email_manager.prepare_emails(script_execution_time=duration_formatted)
+
+                # 9. Send the mails
+                email_manager.send_emails(is_error=not success)
+            else:
+                lg.info("E-mail alerts are disabled for this outcome, skipping the e-mail report.")
         except Exception as email_error:
-            lg.info(f"Failed to send emails: {email_error}")
+            lg.info("Failed to send emails: %s", email_error)
 
         try:
             # 10. Log maintenance
@@ -0,0 +1,15 @@
+# Import libraries
+import os, sys, shutil, tempfile
+
+# The modules import each other as top-level packages (utilities, connectors ...), as run_script.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# logging_manager creates <project_root>/metadata/logs from sys.argv[0] (.../script_runner/run_script.py).
+# Point it at a throwaway project root, so the tests don't leave log folders behind.
+_project_root = tempfile.mkdtemp(prefix="etl_tests_")
+sys.argv[0] = os.path.join(_project_root, "script_runner", "pytest")
+os.environ.setdefault("ETL_LOG_CONSOLE", "0")
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_project_root, ignore_errors=True)
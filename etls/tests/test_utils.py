@@ -0,0 +1,419 @@
+# Import libraries
+import os, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# import custom libraries
+import utilities.orchestration_utils as orchestration_utils
+from utilities.argument_parser import parse_arguments
+from utilities.email_manager import EmailManager
+from utilities.file_utils import normalize
+from utilities.logging_manager import cleanup_old_logs
+from utilities.orchestration_utils import backoff_delay, build_task_levels, run_task_graph, validate_task_graph
+from utilities.error_utils import DependencyError, ETLError, RetryableError
+
+
+def make_task(name, depends_on=None, function=None, retries=0, calls=None):
+    """Build a task dictionary like ScriptFactory.tasks, recording the calls in 'calls'."""
+    def run():
+        if calls is not None:
+            calls.append(name)
+        if function is not None:
+            function()
+
+    return {"task_name": name,
+            "description": name,
+            "function": run,
+            "depends_on": depends_on,
+            "is_enabled": True,
+            "retries": retries}
+
+
+def run_plan(plan, max_workers=4, messages=False):
+    """Run the plan and return {task_name: status}, or {task_name: message} with messages=True."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = run_task_graph(executor=executor,
+                                 plan=plan,
+                                 collect_logs=False)
+    return {name: message if messages else status for name, (status, message, _) in results.items()}
+
+
+def fail(error=RuntimeError("boom")):
+    def raise_error():
+        raise error
+    return raise_error
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    # Retries are re-submitted right away
+    monkeypatch.setattr(orchestration_utils, "backoff_delay", lambda attempt: 0.0)
+
+
+# ===========================================================
+# backoff_delay
+# ===========================================================
+
+def test_backoff_delay_stays_within_the_capped_window():
+    for attempt in range(10):
+        window = min(30.0, 0.5 * (2 ** attempt))
+        for _ in range(100):
+            assert 0.0 <= backoff_delay(attempt) <= window
+
+
+def test_backoff_delay_custom_base_and_cap():
+    assert all(backoff_delay(20, base=1.0, cap=2.0) <= 2.0 for _ in range(100))
+
+
+# ===========================================================
+# validate_task_graph / build_task_levels
+# ===========================================================
+
+def test_validate_task_graph_rejects_a_cycle():
+    tasks = [make_task("a", "c"), make_task("b", "a"), make_task("c", "b"), make_task("d")]
+    with pytest.raises(DependencyError, match="cycle"):
+        validate_task_graph(tasks)
+
+
+def test_validate_task_graph_rejects_duplicate_names():
+    with pytest.raises(DependencyError, match="Duplicate"):
+        validate_task_graph([make_task("a"), make_task("a")])
+
+
+def test_validate_task_graph_rejects_unknown_dependencies():
+    with pytest.raises(DependencyError, match="Unknown"):
+        validate_task_graph([make_task("a"), make_task("b", ["a", "missing"])])
+
+
+def test_build_task_levels_diamond():
+    tasks = [make_task("a"), make_task("b", "a"), make_task("c", "a"), make_task("d", ["b", "c"])]
+    levels = [[task["task_name"] for task in level] for level in build_task_levels(tasks)]
+    assert levels == [["a"], ["b", "c"], ["d"]]
+
+
+# ===========================================================
+# run_task_graph
+# ===========================================================
+
+def test_diamond_runs_the_join_after_both_branches():
+    calls = []
+    plan = [make_task("a", calls=calls),
+            make_task("b", "a", calls=calls),
+            make_task("c", "a", calls=calls),
+            make_task("d", ["b", "c"], calls=calls)]
+
+    assert run_plan(plan) == {"a": "SUCCESS", "b": "SUCCESS", "c": "SUCCESS", "d": "SUCCESS"}
+    assert calls[0] == "a" and calls[-1] == "d"
+
+
+def test_independent_branches_run_concurrently():
+    # Both tasks must be running at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    plan = [make_task("a", function=barrier.wait), make_task("b", function=barrier.wait)]
+
+    assert run_plan(plan) == {"a": "SUCCESS", "b": "SUCCESS"}
+
+
+def test_failure_skips_the_descendants():
+    calls = []
+    plan = [make_task("a", calls=calls),
+            make_task("b", "a", function=fail(), calls=calls),
+            make_task("c", "b", calls=calls),
+            make_task("d", "c", calls=calls)]
+
+    assert run_plan(plan) == {"a": "SUCCESS", "b": "FAILED", "c": "SKIPPED", "d": "SKIPPED"}
+    assert calls == ["a", "b"]
+
+    # The reason names the failed task, also further down the chain
+    messages = run_plan(plan, messages=True)
+    assert messages["c"] == messages["d"] == "Dependency b failed."
+
+
+def test_failure_halts_the_tasks_not_started_yet():
+    # 'c' only becomes ready after 'b' finished, which is after 'a' failed
+    a_failed = threading.Event()
+
+    def fail_a():
+        a_failed.set()
+        raise RuntimeError("boom")
+
+    def finish_after_a():
+        # Give the runner time to process the failure of 'a' before 'b' completes
+        a_failed.wait(5)
+        time.sleep(0.2)
+
+    calls = []
+    plan = [make_task("a", function=fail_a, calls=calls),
+            make_task("b", function=finish_after_a, calls=calls),
+            make_task("c", "b", calls=calls)]
+
+    assert run_plan(plan) == {"a": "FAILED", "b": "SUCCESS", "c": "SKIPPED"}
+    assert "c" not in calls
+
+
+def test_halted_task_reason_is_carried_to_its_descendants():
+    a_failed = threading.Event()
+
+    def fail_a():
+        a_failed.set()
+        raise RuntimeError("boom")
+
+    def finish_after_a():
+        # Give the runner time to process the failure of 'a' before 'b' completes
+        a_failed.wait(5)
+        time.sleep(0.2)
+
+    plan = [make_task("a", function=fail_a),
+            make_task("b", function=finish_after_a),
+            make_task("c", "b"),
+            make_task("d", "c")]
+
+    messages = run_plan(plan, messages=True)
+    assert messages["c"] == messages["d"] == "Pipeline halted after a failure."
+
+
+def test_dependency_outside_the_plan_skips_the_task():
+    calls = []
+    plan = [make_task("b", "disabled", calls=calls), make_task("c", "b", calls=calls)]
+
+    assert run_plan(plan) == {"b": "SKIPPED", "c": "SKIPPED"}
+    assert calls == []
+    assert run_plan(plan, messages=True) == {"b": "Dependency disabled is not enabled.",
+                                             "c": "Dependency disabled is not enabled."}
+
+
+def test_join_waits_for_every_dependency():
+    calls = []
+    plan = [make_task("a", calls=calls),
+            make_task("b", function=fail(), calls=calls),
+            make_task("c", ["a", "b"], calls=calls)]
+
+    assert run_plan(plan)["c"] == "SKIPPED"
+    assert "c" not in calls
+
+
+def test_retryable_error_is_retried_until_success():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RetryableError("temporary")
+
+    plan = [make_task("a", function=flaky, retries=2)]
+
+    assert run_plan(plan) == {"a": "SUCCESS"}
+    assert len(attempts) == 3
+
+
+def test_retries_are_exhausted():
+    calls = []
+    plan = [make_task("a", function=fail(), retries=2, calls=calls)]
+
+    assert run_plan(plan) == {"a": "FAILED"}
+    assert calls == ["a", "a", "a"]
+
+
+def test_non_retryable_etl_error_fails_fast():
+    calls = []
+    plan = [make_task("a", function=fail(ETLError("bad config")), retries=3, calls=calls)]
+
+    assert run_plan(plan) == {"a": "FAILED"}
+    assert calls == ["a"]
+
+
+def test_retry_does_not_hold_a_worker():
+    # With a single worker, 'b' runs while 'a' waits for its retry
+    order = []
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        order.append("a")
+        if len(attempts) == 1:
+            raise RetryableError("temporary")
+
+    plan = [make_task("a", function=flaky, retries=1),
+            make_task("b", function=lambda: order.append("b"))]
+
+    assert run_plan(plan, max_workers=1) == {"a": "SUCCESS", "b": "SUCCESS"}
+    assert order == ["a", "b", "a"]
+
+
+def test_backoff_without_running_tasks_does_not_spin(monkeypatch):
+    # Only a retry is left: the loop must sleep until it is due, not poll wait() in a loop
+    monkeypatch.setattr(orchestration_utils, "backoff_delay", lambda attempt: 0.3)
+    wait_calls = []
+    real_wait = orchestration_utils.wait
+
+    def counting_wait(*args, **kwargs):
+        wait_calls.append(1)
+        return real_wait(*args, **kwargs)
+
+    monkeypatch.setattr(orchestration_utils, "wait", counting_wait)
+
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RetryableError("temporary")
+
+    cpu_start = time.process_time()
+    assert run_plan([make_task("a", function=flaky, retries=1)]) == {"a": "SUCCESS"}
+
+    assert len(wait_calls) <= 4
+    assert time.process_time() - cpu_start < 0.2
+
+
+# ===========================================================
+# argument_parser
+# ===========================================================
+
+parser_settings = SimpleNamespace(load_type="I", max_days_to_load=30)
+
+
+def parse(monkeypatch, *arguments):
+    monkeypatch.setattr(sys, "argv", [sys.argv[0], *arguments])
+    return parse_arguments(parser_settings)
+
+
+def test_parse_arguments_defaults(monkeypatch):
+    assert parse(monkeypatch) == (None, "I", 30)
+
+
+def test_parse_arguments_sdt_and_config_in_any_order(monkeypatch):
+    assert parse(monkeypatch, "config=F7", "sdt=2024-02-29") == ("2024-02-29", "F", 7)
+    assert parse(monkeypatch, "sdt=2024-01-31", "config=F") == ("2024-01-31", "F", 30)
+
+
+@pytest.mark.parametrize("arguments, message", [
+    (["sdt"], "Expected format <name>=<value>"),
+    (["sdt=", "config=F"], "Invalid value for 'sdt'"),
+    (["project=a=b"], "Invalid value for 'project'"),
+    (["unknown=1"], "Unknown argument 'unknown'"),
+    (["config=F", "config=F2"], "Duplicate argument 'config'"),
+    (["sdt=2024-01-01"], "must be provided together"),
+])
+def test_parse_arguments_rejects_invalid_input(monkeypatch, arguments, message):
+    with pytest.raises(ValueError, match=message):
+        parse(monkeypatch, *arguments)
+
+
+def test_parse_arguments_rejects_dates_missing_from_the_calendar(monkeypatch):
+    with pytest.raises(ValueError, match="Invalid date for 'sdt'") as error:
+        parse(monkeypatch, "sdt=2023-02-29", "config=F")
+
+    # The error is raised on purpose, not while handling the fromisoformat error
+    assert error.value.__cause__ is None
+    assert error.value.__suppress_context__
+
+
+# ===========================================================
+# logging_manager.cleanup_old_logs
+# ===========================================================
+
+def make_log(log_dir, name, age_days=0.0):
+    path = log_dir / f"{name}_etl.log"
+    path.write_text("log")
+    modified = time.time() - age_days * 86400
+    os.utime(path, (modified, modified))
+    return path
+
+
+def test_cleanup_old_logs_keeps_the_newest_files(tmp_path):
+    logs = [make_log(tmp_path, f"2026-01-0{day}", age_days=10 - day) for day in range(1, 5)]
+    other = tmp_path / "notes.txt"
+    other.write_text("not a log")
+
+    cleanup_old_logs(log_dir=str(tmp_path), retention_number=2, mode="N")
+
+    assert [log.exists() for log in logs] == [False, False, True, True]
+    assert other.exists()
+
+
+def test_cleanup_old_logs_age_sweep_runs_once_per_day(tmp_path):
+    old_log = make_log(tmp_path, "old", age_days=5)
+    new_log = make_log(tmp_path, "new")
+    stale_sentinel = tmp_path / ".purged_20000101"
+    stale_sentinel.write_text("")
+
+    cleanup_old_logs(log_dir=str(tmp_path), retention_number=2, mode="R")
+
+    assert not old_log.exists() and new_log.exists()
+    assert (tmp_path / f".purged_{time.strftime('%Y%m%d')}").exists()
+    assert not stale_sentinel.exists()
+
+    # Later runs of the same day skip the directory scan
+    later_old_log = make_log(tmp_path, "later_old", age_days=5)
+    cleanup_old_logs(log_dir=str(tmp_path), retention_number=2, mode="R")
+    assert later_old_log.exists()
+
+
+def test_cleanup_old_logs_disabled_keeps_everything(tmp_path):
+    old_log = make_log(tmp_path, "old", age_days=5)
+    cleanup_old_logs(log_dir=str(tmp_path), retention_number=0, is_enabled=False, mode="R")
+    assert old_log.exists()
+
+
+# ===========================================================
+# email_manager.add_log_block_to_email
+# ===========================================================
+
+def make_email_manager():
+    factory = SimpleNamespace(list_recipients_admin=[],
+                              list_recipients_business=[],
+                              list_recipients_error=[],
+                              is_admin_email_enabled=False,
+                              is_business_email_enabled=False,
+                              is_error_email_enabled=False)
+    return EmailManager(factory=factory)
+
+
+def test_add_log_block_to_email_escapes_the_logs():
+    email_manager = make_email_manager()
+    email_manager.add_log_block_to_email(task_name="a", logs="value <b>5</b> & more")
+
+    assert "value &lt;b&gt;5&lt;/b&gt; &amp; more" in email_manager.html_logs_blocks
+    assert "<b>5</b>" not in email_manager.html_logs_blocks
+
+
+def test_add_log_block_to_email_keeps_the_tail_of_long_logs():
+    email_manager = make_email_manager()
+    email_manager.add_log_block_to_email(task_name="a", logs="x" * 50 + "ERROR<end>", max_log_chars=10)
+
+    block = email_manager.html_logs_blocks
+    assert "... 50 earlier characters truncated, see the log file ..." in block
+    assert "ERROR&lt;end&gt;" in block
+    assert "x" * 11 not in block
+
+
+def test_add_log_block_to_email_without_logs():
+    email_manager = make_email_manager()
+    email_manager.add_log_block_to_email(task_name="a", logs="  \n ")
+    assert "No logs captured for this task." in email_manager.html_logs_blocks
+
+
+# ===========================================================
+# file_utils.normalize
+# ===========================================================
+
+def test_normalize_resolves_the_path(monkeypatch, tmp_path):
+    monkeypatch.setenv("ETL_TEST_DIR", str(tmp_path))
+    normalize.cache_clear()
+
+    assert normalize("$ETL_TEST_DIR/a/../b") == os.path.join(str(tmp_path), "b")
+    assert normalize(Path(tmp_path) / "c" / ".") == os.path.join(str(tmp_path), "c")
+
+
+def test_normalize_caches_repeated_paths(tmp_path):
+    normalize.cache_clear()
+    path = str(tmp_path / "a" / ".." / "b")
+
+    first = normalize(path)
+    assert normalize(path) == first
+    assert normalize.cache_info().hits == 1
+    assert normalize.cache_info().misses == 1
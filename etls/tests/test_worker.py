@@ -0,0 +1,40 @@
+# Import libraries
+import os, sys
+
+# The custom code of a project is imported as a top-level package, as its run_script.py does
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "datastore", "financial_data_1_ethereum"))
+
+# import custom libraries
+from custom_code import sql_queries as queries
+
+
+def test_column_name_pattern_skips_blank_and_comment_lines():
+    columns = """
+        id          TEXT,
+
+        -- commented_out TEXT,
+      amount        NUMERIC,
+    \tcreated_at    TIMESTAMPTZ
+    """
+    assert queries._column_name_pattern.findall(columns) == ["id", "amount", "created_at"]
+
+
+def test_source_columns_match_the_create_statement():
+    # The first word of every non-empty line of source_columns_create
+    expected = [line.split()[0] for line in queries.source_columns_create.splitlines() if line.strip()]
+    assert queries.source_cols_general_list == expected
+
+
+def test_merge_clauses():
+    sql_queries = queries.sql_queries
+    normal_cols = [col for col in queries.source_cols_general_list if col != "tax_hash"]
+
+    assert sql_queries["on_clause"] == "t.tax_hash = s.tax_hash"
+    assert sql_queries["update_clause"] == ("etl_runs_key = s.etl_runs_key, "
+                                            + ", ".join(f"{col} = s.{col}" for col in normal_cols)
+                                            + ", modified_at = CURRENT_TIMESTAMP")
+    assert sql_queries["insert_columns"] == ("etl_runs_key, " + ", ".join(queries.source_cols_general_list)
+                                             + ", created_at, modified_at")
+    assert sql_queries["insert_values"].startswith("s.etl_runs_key, s.id, s.raw_number_value, ")
+    assert sql_queries["insert_values"].endswith(", current_timestamp, current_timestamp")
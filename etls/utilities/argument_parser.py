@@ -1,7 +1,19 @@
 import sys, re
+from datetime import date
 from typing import Optional, Tuple, Any
 import utilities.logging_manager as lg
 
+# Regex validation rules for each argument, compiled once at import
+_validation_rules = {
+    "sdt"       : re.compile(r"^\d{4}-\d{2}-\d{2}$"),
+    "edt"       : re.compile(r"^\d{4}-\d{2}-\d{2}$"),
+    "config"    : re.compile(r"^F\d*$"),
+    "project"   : re.compile(r"^[A-Za-z0-9_]+$"),
+}
+
+# Arguments holding a calendar date
+_date_arguments = {"sdt", "edt"}
+
 def parse_arguments(settings: Any) -> Tuple[Optional[str], str, int]:
     """
     1. A flexible argument parser supporting any order and optional parameters.
@@ -18,47 +30,46 @@ def parse_arguments(settings: Any) -> Tuple[Optional[str], str, int]:
         A tuple of start date time, load type and maximum number of days to load
     """
 
-    lg.info(f"DEBUG sys.argv: {sys.argv}")
+    lg.info("DEBUG sys.argv: %s", sys.argv)
 
     # 1. Define a dictionary storage for parsed arguments
     parsed = {}
 
-    # 2. Define regex validation rules for each argument
-    validation_rules = {
-        "sdt"       : r"^\d{4}-\d{2}-\d{2}$",
-        "edt"       : r"^\d{4}-\d{2}-\d{2}$",
-        "config"    : r"^F\d*$",
-        "project"   : r"^[A-Za-z0-9_]+$",
-    }
+    # 2. Use the precompiled regex validation rules
+    validation_rules = _validation_rules
 
     # 3. Iterate over all arguments (except sys.argv[0] = ... .run_script_py name)
     for argument in sys.argv[1:]:
 
-        # 4. Check if equality exists in the argument
-        if "=" not in argument:
-            raise ValueError(f"Invalid argument '{argument}'. Expected format <name>=<value>.")
+        # 4. Split the argument by (maximum one) equality sign in a single pass
+        name, separator, value = argument.partition("=")
 
-        # 5. Split the argument by (maximum one) equality sign
-        name, value = argument.split("=", 1)
+        # 5. Check if equality exists in the argument
+        if not separator:
+            raise ValueError(f"Invalid argument '{argument}'. Expected format <name>=<value>.")
 
         # 6. Check if the name exists in the validation_rules dictionary
-        if name not in validation_rules.keys():
+        if name not in validation_rules:
             raise ValueError(f"Unknown argument '{name}'. Allowed arguments: {list(validation_rules.keys())}")
 
         # 7. Check if duplicated argument names were provided
         if name in parsed:
             raise ValueError(f"Duplicate argument '{name}' is not allowed.")
 
-        # 8. Assign the regex pattern to a variable
-        pattern = validation_rules[name]
-
-        # 9. Check if the value matches the regex pattern
-        if not re.match(pattern, value):
+        # 8. Check if the value matches the precompiled regex pattern
+        if not validation_rules[name].match(value):
             raise ValueError(f"Invalid value for '{name}': '{value}'.")
 
+        # 9. Check that dates exist in the calendar (e.g. reject 2024-02-30)
+        if name in _date_arguments:
+            try:
+                date.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f"Invalid date for '{name}': '{value}'.") from None
+
         # 10. Log the argument
         parsed[name] = value
-        lg.info(f"Parsed argument: {name}={value}")
+        lg.info("Parsed argument: %s=%s", name, value)
 
     # 11. Require both, start date time (=sdt) and config arguments, to be provided.
     if ("sdt" in parsed and "config" not in parsed) or ("sdt" not in parsed and "config" in parsed):
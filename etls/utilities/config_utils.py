@@ -18,7 +18,7 @@ def load_smtp_config() -> Dict[str, str]:
 
     # 2. Check if the path exists
     if not os.path.exists(config_path):
-        lg.error(f"Configuration file not found: {config_path}")
+        lg.error("Configuration file not found: %s", config_path)
         raise FileNotFoundError(f"Missing {config_path}")
 
     # 3. Read the config_path
@@ -1,5 +1,5 @@
 # import libraries
-import smtplib, os, configparser
+import smtplib, os, configparser, html
 from typing import Dict
 from email.mime.text import MIMEText
 from datetime import datetime
@@ -7,6 +7,7 @@ from datetime import datetime
 # import custom libraries
 import utilities.logging_manager as lg
 from utilities.config_utils import load_smtp_config
+from utilities.orchestration_utils import task_dependencies
 
 class EmailManager:
     """
@@ -46,6 +47,9 @@ class EmailManager:
         self.is_admin_email_alert_enabled = self.factory.is_admin_email_enabled
         self.is_business_email_alert_enabled = self.factory.is_business_email_enabled
         self.is_error_email_alert_enabled = self.factory.is_error_email_enabled
+        self.is_any_email_alert_enabled = (self.is_admin_email_alert_enabled
+                                           or self.is_business_email_alert_enabled
+                                           or self.is_error_email_alert_enabled)
 
         # SMTP config loaded by the internal helper function
         self.smtp_config = None
@@ -103,7 +107,7 @@ class EmailManager:
                 <td>{task.get('description', '')}</td>
                 <td>{task.get("is_enabled")}</td>
                 <td>{task.get("retries")}</td>
-                <td>{task.get("depends_on")}</td>
+                <td>{", ".join(task_dependencies(task)) or None}</td>
                 <td>{status_text}</td>
             </tr>
         """
@@ -111,10 +115,13 @@ class EmailManager:
     def add_log_block_to_email(self,
                                task_name: str,
                                logs: str,
-                               task: dict = None) -> None:
+                               task: dict = None,
+                               max_log_chars: int = 20_000) -> None:
         """
         1. Appends a formatted block of logs to the email. This method is called iteratively as each task completes.
         2. If a task is provided, add its parameters to the log block at the top.
+        2.1. Only the last max_log_chars characters of the logs are rendered, so a chatty task
+        cannot blow up the size of the e-mail (the full logs stay in the log file).
         3. The format of the log block:
              TASK <number>: <task_name>
              <task_parameters>
@@ -125,6 +132,7 @@ class EmailManager:
             task_name: name of the task
             logs: the log messages for that particular task
             task: a dictionary with task metadata (as defined in script_factory.py)
+            max_log_chars: the maximum number of log characters rendered for the task
         """
 
         # 1. Prepare task parameters if available
@@ -146,6 +154,12 @@ class EmailManager:
         # 2. Strip whitespace if logs exist and aren't just whitespace; otherwise, use a fallback message.
         display_logs = logs.strip() if (logs and logs.strip()) else "No logs captured for this task."
 
+        # 2.1. Keep the tail of long logs (the error is at the end) and escape it once for HTML
+        truncated_chars = len(display_logs) - max_log_chars
+        if truncated_chars > 0:
+            display_logs = f"... {truncated_chars} earlier characters truncated, see the log file ...\n" + display_logs[-max_log_chars:]
+        display_logs = html.escape(display_logs, quote=False)
+
         # 3. Append the log block including parameters first
         # TASK <number>: <task_name>
         # <task_parameters>
@@ -251,6 +265,21 @@ class EmailManager:
             "body"      : html_body
         }
 
+    def is_email_alert_enabled(self, is_error: bool = False) -> bool:
+        """
+        Check whether any recipient group receives an e-mail for the script outcome,
+        so the report is only assembled when it will be sent.
+
+        Args:
+            is_error: Flag indicating if the script failed. Defaults to False (Success).
+
+        Returns:
+            True if the admin group, or the group of the outcome (business/error), has alerts enabled.
+        """
+        return (self.is_admin_email_alert_enabled
+                or (not is_error and self.is_business_email_alert_enabled)
+                or (is_error and self.is_error_email_alert_enabled))
+
     def send_emails(self, is_error: bool = False) -> None:
         """
         1. Builds the email_payload based on the script outcome.
@@ -323,8 +352,8 @@ class EmailManager:
         # 1. Load the server credentials
         self.smtp_config = load_smtp_config()
 
-        lg.info(f"Sending email to: {to}")
-        lg.info(f"Subject: {subject}")
+        lg.info("Sending email to: %s", to)
+        lg.info("Subject: %s", subject)
 
         # 2. Create a MIME email object with the given HTML body.
         # MIMEText handles proper encoding and marks the content type as HTML.
@@ -74,6 +74,7 @@ class EtlAuditManager:
         self.sfc = sfc                                                          # An instance of ScriptFactory class
         self.swc = swc                                                          # An instance of ScriptWorker class
         self.credential_name = credential_name                                  # Name of credential connection
+        self.environment = os.environ.get('MACHINE_SCRIPT_RUNNER_ENV')          # Runtime environment (read once)
 
         # State tracking for the current ETL run
         self.etl_runs_key: Optional[int] = None                                   # An ETL run key identifier
@@ -163,63 +164,63 @@ class EtlAuditManager:
 
         # 1. Get the latest successfully loaded data max date
         result_data_max_date = self.pg_connector.run_query(query=prev_max_date_query, commit=False, get_result=True)
-        lg.info(f"Result data max date: {result_data_max_date}")
+        lg.info("Result data max date: %s", result_data_max_date)
 
         # 2. Check if the query actually returned a date
         if not result_data_max_date.empty:
             # Assign it to a variable, .iat[0, 0] retrieves the first row, first column
             value = result_data_max_date.iat[0, 0]
-            lg.info(f"The _calculate_etl_window value: {value}")
+            lg.info("The _calculate_etl_window value: %s", value)
             if value is not None:
                 self.prev_max_date = value
-                lg.info(f"The _calculate_etl_window prev_max_date: {self.prev_max_date}")
+                lg.info("The _calculate_etl_window prev_max_date: %s", self.prev_max_date)
             else:
                 self.prev_max_date = None
-                lg.info(f"The _calculate_etl_window prev_max_date: {self.prev_max_date}")
+                lg.info("The _calculate_etl_window prev_max_date: %s", self.prev_max_date)
         else:
             self.prev_max_date = None
-            lg.info(f"The _calculate_etl_window prev_max_date: {self.prev_max_date}")
+            lg.info("The _calculate_etl_window prev_max_date: %s", self.prev_max_date)
 
         # 3. Generate a current reference timestamp
         now_utc = datetime.datetime.now(timezone.utc)
-        lg.info(f"The NOW UTC: {now_utc}")
+        lg.info("The NOW UTC: %s", now_utc)
 
-        lg.info(f"Running in {load_type} mode.")
+        lg.info("Running in %s mode.", load_type)
         # 4. Determine sdt (start date time) for F and I modes
         if load_type == 'F':
             # if we pass a date in .bat file (=forced_sdt)
             if forced_sdt:
-                forced_sdt = datetime.datetime.strptime(forced_sdt, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-                lg.info(f"Forced sdt (F mode): {forced_sdt}")
+                forced_sdt = datetime.datetime.fromisoformat(forced_sdt).replace(tzinfo=timezone.utc)
+                lg.info("Forced sdt (F mode): %s", forced_sdt)
 
                 self.sdt = forced_sdt  # this should become the new start date
-                lg.info(f"The sdt (F mode): {self.sdt}")
+                lg.info("The sdt (F mode): %s", self.sdt)
             elif self.prev_max_date:   # if not, start from the previous_max_date
                 self.sdt = self.prev_max_date
-                lg.info(f"The sdt (F mode): {self.sdt}")
+                lg.info("The sdt (F mode): %s", self.sdt)
             else:
                 # elif self.prev_max_date is None:
                 raise ValueError("F mode requires either a forced_sdt or a previous max date.")
 
             # 5. Determine edt (F mode loads exactly X days)
             self.edt = self.sdt + timedelta(days=max_days_to_load)
-            lg.info(f"The edt (F mode): {self.edt}")
+            lg.info("The edt (F mode): %s", self.edt)
 
         # 6. Incremental load: Start from where we left off last time.
         elif load_type == 'I' and self.prev_max_date:
             # If increment_sdt is True, we add 1 day (standard if data is daily-partitioned, e.g. for ftp projects).
             self.sdt = self.prev_max_date + timedelta(days=1) if increment_sdt else self.prev_max_date
-            lg.info(f"The sdt (I mode): {self.sdt}")
+            lg.info("The sdt (I mode): %s", self.sdt)
 
             # 7. Determine EDT (incremental cannot load future data)
             max_window_end = self.sdt + timedelta(days=max_days_to_load)
-            lg.info(f"The _calculate_etl_window max_window_end: {max_window_end}")
+            lg.info("The _calculate_etl_window max_window_end: %s", max_window_end)
 
             # 8. EDT becomes the minimum of now_utc and max_window_end
             self.edt = min(now_utc, max_window_end)
-            lg.info(f"The edt (I mode): {self.edt}")
+            lg.info("The edt (I mode): %s", self.edt)
 
-        lg.info(f"The final _calculate_etl_window self.sdt and self.edt values: {self.sdt} {self.edt}")
+        lg.info("The final _calculate_etl_window self.sdt and self.edt values: %s %s", self.sdt, self.edt)
         return self.sdt, self.edt
 
     def insert_audit_etl_runs_record(
@@ -276,8 +277,9 @@ class EtlAuditManager:
         # 1. If running for a first time, create the schema and the table
         self.pg_connector.create_schema(schema='audit')
 
-        lg.info(f"Running the create_audit_etl_runs_table query: {EtlAuditManager.create_audit_etl_runs_table()}")
-        self.pg_connector.run_query(query=EtlAuditManager.create_audit_etl_runs_table())
+        create_table_query = EtlAuditManager.create_audit_etl_runs_table()
+        lg.info("Running the create_audit_etl_runs_table query: %s", create_table_query)
+        self.pg_connector.run_query(query=create_table_query)
 
         # 2. Process some of the variables
         sources_string = ", ".join(sources)
@@ -290,7 +292,8 @@ class EtlAuditManager:
                                                         forced_sdt=forced_sdt)
 
         # 4. Insert query
-        insert_query = f"""
+        # The values are bound as typed parameters (datetime -> TIMESTAMPTZ), no strftime or quoting in Python
+        insert_query = """
             INSERT INTO audit.etl_runs (
                 load_type, 
                 sources, 
@@ -303,27 +306,27 @@ class EtlAuditManager:
                 status, 
                 script_version
             )
-            VALUES (
-                '{load_type}', 
-                '{sources_string}', 
-                '{target_database}', 
-                '{target_table}', 
-                '{self.sdt.strftime('%Y-%m-%d %H:%M:%S.%f%z')}', 
-                '{self.edt.strftime('%Y-%m-%d %H:%M:%S.%f%z')}', 
-                CURRENT_TIMESTAMP, 
-                '{os.environ.get('MACHINE_SCRIPT_RUNNER_ENV')}', 
-                'In Progress', 
-                '{script_version}'
-            )
+            VALUES (%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP, %s, 'In Progress', %s)
             RETURNING etl_runs_key;
         """
+        insert_params = (load_type,
+                         sources_string,
+                         target_database,
+                         target_table,
+                         self.sdt,
+                         self.edt,
+                         self.environment,
+                         script_version)
 
         # 5. Run the insert query
-        lg.info(f"Running the INSERT INTO query: {insert_query}")
+        lg.info("Running the INSERT INTO query: %s with parameters %s", insert_query, insert_params)
 
-        # 6. The method .iat[0, 0] retrieves the first row, first column
-        self.etl_runs_key = self.pg_connector.run_query(query=insert_query, commit=True, get_result=True).iat[0, 0]
-        lg.info(f"Etl_runs_key: {self.etl_runs_key}")
+        # 6. The method .iat[0, 0] retrieves the first row, first column (cast from numpy.int64 to bind it later)
+        self.etl_runs_key = int(self.pg_connector.run_query(query=insert_query,
+                                                            params=insert_params,
+                                                            commit=True,
+                                                            get_result=True).iat[0, 0])
+        lg.info("Etl_runs_key: %s", self.etl_runs_key)
 
     def update_etl_runs_table_record(self, status: str) -> None:
         """
@@ -334,37 +337,39 @@ class EtlAuditManager:
 
         # 1. Fetch the number of records in the df
         self.num_of_records = self.swc.num_of_records
-        lg.info(f"Final count pulled from script worker: {self.num_of_records}")
+        lg.info("Final count pulled from script worker: %s", self.num_of_records)
 
         # 2. Fetch data_min_date and data_max_date from Script Worker if they exist (len(df) > 0)
         # Otherwise, set sdt to data_min_date and data_max_date
         if self.swc.data_min_date:
             self.data_min_date = self.swc.data_min_date
-        lg.info(f"Data min date pulled from script worker: {self.data_min_date}")
+        lg.info("Data min date pulled from script worker: %s", self.data_min_date)
 
         if self.swc.data_max_date:
             self.data_max_date = self.swc.data_max_date
-        lg.info(f"Data min date pulled from script worker: {self.data_max_date}")
-
-        # 3. Format dates for SQL
-        data_min_val = f"'{self.data_min_date.strftime('%Y-%m-%d %H:%M:%S.%f%z')}'" if self.data_min_date is not None else "NULL"
-        data_max_val = f"'{self.data_max_date.strftime('%Y-%m-%d %H:%M:%S.%f%z')}'" if self.data_max_date is not None else "NULL"
-        prev_date_val = f"'{self.prev_max_date.strftime('%Y-%m-%d %H:%M:%S.%f%z')}'" if self.prev_max_date else "NULL"
+        lg.info("Data min date pulled from script worker: %s", self.data_max_date)
 
-        # 4. Update Query
-        update_query = f"""
+        # 3. Update Query
+        # None is bound as NULL, datetimes as TIMESTAMPTZ
+        update_query = """
             UPDATE audit.etl_runs 
             SET  
-                data_min_date = {data_min_val},
-                data_max_date = {data_max_val},
+                data_min_date = %s,
+                data_max_date = %s,
                 script_execution_end_time = CURRENT_TIMESTAMP,
-                status = '{status}',
-                num_of_records = {self.num_of_records},
-                prev_max_date = {prev_date_val},
+                status = %s,
+                num_of_records = %s,
+                prev_max_date = %s,
                 modified_at = CURRENT_TIMESTAMP
-            WHERE etl_runs_key = {self.etl_runs_key};
+            WHERE etl_runs_key = %s;
         """
-
-        # 5. Run the update query
-        lg.info(f"Running the UPDATE query: {update_query}")
-        self.pg_connector.run_query(query=update_query, commit=True, get_result=False)
\ No newline at end of file
+        update_params = (self.data_min_date,
+                         self.data_max_date,
+                         status,
+                         self.num_of_records,
+                         self.prev_max_date or None,
+                         self.etl_runs_key)
+
+        # 4. Run the update query
+        lg.info("Running the UPDATE query: %s with parameters %s", update_query, update_params)
+        self.pg_connector.run_query(query=update_query, params=update_params, commit=True, get_result=False)
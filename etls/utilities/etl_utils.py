@@ -52,7 +52,7 @@ class EtlUtils:
 
         # 3. Rename the columns
         df = df.rename(columns=rename_columns_dict)
-        lg.info(f"Renaming the columns {rename_columns_dict} completed successfully.")
+        lg.info("Renaming the columns %s completed successfully.", rename_columns_dict)
         return df
 
     @staticmethod
@@ -95,7 +95,7 @@ class EtlUtils:
 
         # 3. Filter the list to only include columns that actually exist AND are objects/strings
         valid_string_cols = df[columns_strip_list].select_dtypes(include=['object', 'string']).columns
-        lg.info(f"Valid string columns list: {valid_string_cols}.")
+        lg.info("Valid string columns list: %s.", valid_string_cols)
 
         # 4. Apply transformation only to valid columns
         lg.info("Stripping whitespace from column values.")
@@ -103,7 +103,7 @@ class EtlUtils:
             # Vectorized strip and replace
             df[col] = df[col].str.strip().replace('', np.nan)
 
-        lg.info(f"Stripping column values in {columns_strip_list} completed successfully.")
+        lg.info("Stripping column values in %s completed successfully.", columns_strip_list)
         return df
 
     @staticmethod
@@ -143,7 +143,7 @@ class EtlUtils:
         for col in columns_replace_backslash_list:
             df[col] = df[col].astype(str).str.replace("\\", replace_with, regex=False)
 
-        lg.info(f"Backslash replacement in {columns_replace_backslash_list} completed successfully.")
+        lg.info("Backslash replacement in %s completed successfully.", columns_replace_backslash_list)
         return df
 
     @staticmethod
@@ -181,7 +181,7 @@ class EtlUtils:
         for col in columns_escape_backslash_list:
             df[col] = df[col].astype(str).str.replace("\\", "\\\\", regex=False)
 
-        lg.info(f"Escaping backslash in {columns_escape_backslash_list} completed successfully.")
+        lg.info("Escaping backslash in %s completed successfully.", columns_escape_backslash_list)
         return df
 
     @staticmethod
@@ -226,7 +226,7 @@ class EtlUtils:
             # This converts both back to a proper numpy NaN object.
             df[col] = df[col].replace(['', 'nan'], np.nan)
 
-        lg.info(f"Sanitizing columns {columns_sanitize_list} completed successfully.")
+        lg.info("Sanitizing columns %s completed successfully.", columns_sanitize_list)
         return df
 
     @staticmethod
@@ -271,7 +271,7 @@ class EtlUtils:
             # 3. Replace empty strings with None, so Postgres sees NULLs instead of ""
             df[col] = df[col].replace('', None)
 
-        lg.info(f"Formating date columns {columns_date_config_dict} completed successfully.")
+        lg.info("Formating date columns %s completed successfully.", columns_date_config_dict)
         return df
 
     @staticmethod
@@ -303,7 +303,7 @@ class EtlUtils:
                 raise KeyError(f"Column '{col}' not found.")
 
         # 3. Convert the columns to integers
-        lg.info(f"Converting the columns in {columns_int_list} to integers.")
+        lg.info("Converting the columns in %s to integers.", columns_int_list)
         for col in columns_int_list:
 
             # 4. Convert to numeric, raising an error for invalid strings
@@ -319,7 +319,7 @@ class EtlUtils:
             # 6. Convert to nullable Int64
             df[col] = numeric_series.astype('Int64')
 
-        lg.info(f"Conversion of columns {columns_int_list} to Int64 was successful.")
+        lg.info("Conversion of columns %s to Int64 was successful.", columns_int_list)
         return df
 
     @staticmethod
@@ -352,7 +352,7 @@ class EtlUtils:
                 raise KeyError(f"Column '{col}' not found.")
 
         # 3. Convert the columns to floats
-        lg.info(f"Converting the columns in {columns_numeric_list} to nullable Float64.")
+        lg.info("Converting the columns in %s to nullable Float64.", columns_numeric_list)
         for col in columns_numeric_list:
 
             # 1. Replace empty strings or whitespace-only strings with np.nan
@@ -366,7 +366,7 @@ class EtlUtils:
             # 3. Cast to nullable 'Float64'
             df[col] = pd.to_numeric(df[col], errors='raise').astype('Float64')
 
-        lg.info(f"Conversion of columns {columns_numeric_list} to Float64 was successful.")
+        lg.info("Conversion of columns %s to Float64 was successful.", columns_numeric_list)
         return df
 
     @staticmethod
@@ -394,7 +394,7 @@ class EtlUtils:
 
         # 3. Serialize JSON
         for col in columns_json_list:
-            lg.info(f"Serializing JSON for column: {col}")
+            lg.info("Serializing JSON for column: %s", col)
             # json.dumps ensures double quotes are used: {"key": "value"}
             df[col] = df[col] = [json.dumps(x) if isinstance(x, (dict, list)) else x for x in df[col]]
             # ^ Explanation:
@@ -402,7 +402,7 @@ class EtlUtils:
             # - If x is None/NaN: Leave as is so Postgres sees it as NULL
             # - If x is a string: Skip to avoid "{\"nested\": \"quotes\"}"
 
-        lg.info(f"Serializing JSON columns {columns_json_list} completed successfully.")
+        lg.info("Serializing JSON columns %s completed successfully.", columns_json_list)
         return df
 
     @staticmethod
@@ -437,7 +437,7 @@ class EtlUtils:
             if df[col].isnull().any():
                 raise ValueError(f"Data Quality Error: Column '{col}' contains null values.")
 
-        lg.info(f"Checking columns {columns_non_null_list} for null values completed successfully.")
+        lg.info("Checking columns %s for null values completed successfully.", columns_non_null_list)
         return df
 
     @staticmethod
@@ -484,7 +484,7 @@ class EtlUtils:
                 df = df.drop_duplicates(subset=columns_unique_list, keep='first')
             return df
 
-        lg.info(f"Check for handling duplicates in {columns_unique_list} completed successfully.")
+        lg.info("Check for handling duplicates in %s completed successfully.", columns_unique_list)
         return df
 
     @staticmethod
@@ -634,34 +634,34 @@ class EtlUtils:
         # 2. Create lists with min and max timestamp values
         # For each date/timestamp column, find the min/max and append it to the list
         date_min_list = [pd.to_datetime(df[column], utc=True).min() for column in date_columns]
-        lg.info(f"The date_min_list: {date_min_list}")
+        lg.info("The date_min_list: %s", date_min_list)
 
         date_max_list = [pd.to_datetime(df[column], utc=True).max() for column in date_columns]
-        lg.info(f"The date_max_list: {date_max_list}")
+        lg.info("The date_max_list: %s", date_max_list)
 
         # 3. Calculate min and max values
         calculated_min_date = min(date_min_list)
-        lg.info(f"Calculated_min_date: {calculated_min_date}")
+        lg.info("Calculated_min_date: %s", calculated_min_date)
 
         calculated_max_date = max(date_max_list)
-        lg.info(f"Calculated_max_date: {calculated_max_date}")
+        lg.info("Calculated_max_date: %s", calculated_max_date)
 
         # 4. Normalize ETL window timestamps to UTC-aware timestamps
         sdt_utc = pd.to_datetime(self.sfc.etl_audit_manager.sdt, utc=True)
-        lg.info(f"SDT_UTC: {sdt_utc}")
+        lg.info("SDT_UTC: %s", sdt_utc)
 
         edt_utc = pd.to_datetime(self.sfc.etl_audit_manager.edt, utc=True)
-        lg.info(f"SDT_UTC: {edt_utc}")
+        lg.info("SDT_UTC: %s", edt_utc)
 
         # 5. Protect the ETL audit layer from garbage dates, out‑of‑range dates, late‑arriving data, future timestamps
         # and timezone‑shifted values.
 
         # Determine the minimum/maximum timestamp from the corresponding list and sdt/edt in audit manager
         clamped_data_min_date = max(calculated_min_date, sdt_utc)  # max! not min
-        lg.info(f"The clamped_data_min_date: {clamped_data_min_date}")
+        lg.info("The clamped_data_min_date: %s", clamped_data_min_date)
 
         clamped_data_max_date = min(calculated_max_date, edt_utc)  # min! not max
-        lg.info(f"The clamped_data_max_date: {clamped_data_max_date}")
+        lg.info("The clamped_data_max_date: %s", clamped_data_max_date)
 
         # 6. Add the dates to the etl audit manager
         self.sfc.etl_audit_manager.data_min_date = clamped_data_min_date
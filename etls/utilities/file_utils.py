@@ -1,6 +1,7 @@
 # import libraries
 import os, sys
 from datetime import datetime
+from functools import lru_cache
 
 # import custom libraries
 import utilities.logging_manager as lg
@@ -18,12 +19,13 @@ Purpose:
         - Listing directory contents
 """
 
-def build_output_file_path(table: str) -> str:
+def build_output_file_path(table: str, compress: bool = False) -> str:
     """
     A utility function that creates an output folder to store CSV files from each project's run.
 
     Arg:
         table: Name of the table (the project's table)
+        compress: If True, the file name gets a .gz extension (gzip-compressed CSV)
 
     Returns:
         A string file path.
@@ -32,24 +34,24 @@ def build_output_file_path(table: str) -> str:
     # 1. Get the absolute path of the script being executed (run_script.py)
     # Result: .../project_name/script_runner/run_script.py
     script_path = os.path.abspath(sys.argv[0])
-    lg.info(f"Absolute path of run_script.py: {script_path}")
+    lg.info("Absolute path of run_script.py: %s", script_path)
 
     # 2. Go up ONE level to get the 'script_runner' folder
     # Result: .../project_name/script_runner
     script_runner_dir = os.path.dirname(script_path)
-    lg.info(f"Path of script_runner folder: {script_runner_dir}")
+    lg.info("Path of script_runner folder: %s", script_runner_dir)
 
     # 3. Go up SECOND level to get the project root
     # Result: .../project_name
     project_root = os.path.dirname(script_runner_dir)
-    lg.info(f"Path of project root: {project_root}")
+    lg.info("Path of project root: %s", project_root)
 
     # 4. Determine the parent directory (e.g. C:\Users\Mihail\PycharmProjects\datawarehouse\etls\datastore\project_name)
-    lg.info(f"Parent Current Directory: {project_root}")
+    lg.info("Parent Current Directory: %s", project_root)
 
     # 5. Build the path to the output directory: project_name/metadata/output and build an output folder
     output_dir = os.path.join(project_root, "metadata", "output")
-    lg.info(f"Output directory: {output_dir}")
+    lg.info("Output directory: %s", output_dir)
 
     # 6. Create directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
@@ -58,27 +60,46 @@ def build_output_file_path(table: str) -> str:
     # e.g. project/metadata/output/ethereum_2026-01-13-18:00:00.csv
     file_timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     file_path = os.path.join(output_dir, f"{table}_{file_timestamp}.csv")
+
+    # 8. Compressed output files are written/read with gzip (detected by the extension)
+    if compress:
+        file_path += ".gz"
     return file_path
 
 # ---------------------------------------------------------------------------
 # 2. File utilities
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=4096)
+def _normalize_cached(path):
+    """
+    Cached body of normalize(). Environment variables and relative paths are resolved
+    on the first call for a given string; call normalize.cache_clear() after
+    changing them (e.g. os.chdir) within a run.
+    """
+    path = os.path.expandvars(path)
+    path = os.path.expanduser(path)
+    path = os.path.normpath(path)
+    return os.path.abspath(path)
+
+
 def normalize(path):
     """
     Normalize a filesystem path by expanding variables, user home,
     resolving relative components, and converting to an absolute path.
+    Results are cached, so repeated calls for the same path skip the getcwd() syscall.
 
     Args:
-        path (str): Input path.
+        path (str | os.PathLike): Input path.
 
     Returns:
         str: Normalized absolute path.
     """
-    path = os.path.expandvars(path)
-    path = os.path.expanduser(path)
-    path = os.path.normpath(path)
-    return os.path.abspath(path)
+    return _normalize_cached(os.fspath(path))
+
+# Expose the cache controls on the public function
+normalize.cache_clear = _normalize_cached.cache_clear
+normalize.cache_info = _normalize_cached.cache_info
 
 
 def join(*parts):
@@ -153,7 +174,9 @@ def list_files(path):
     path = normalize(path)
     if not os.path.isdir(path):
         return []
-    return [f for f in os.listdir(path) if os.path.isfile(os.path.join(path, f))]
+    # DirEntry.is_file() reuses the data of the directory read, no extra stat() per entry
+    with os.scandir(path) as entries:
+        return [entry.name for entry in entries if entry.is_file()]
 
 
 def list_dirs(path):
@@ -169,7 +192,8 @@ def list_dirs(path):
     path = normalize(path)
     if not os.path.isdir(path):
         return []
-    return [d for d in os.listdir(path) if os.path.isdir(os.path.join(path, d))]
+    with os.scandir(path) as entries:
+        return [entry.name for entry in entries if entry.is_dir()]
 
 
 def read_text(path, encoding="utf-8"):
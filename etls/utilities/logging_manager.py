@@ -1,6 +1,6 @@
 # import libraries
-import logging, os, sys
-from datetime import datetime
+import logging, os, sys, queue, atexit, time
+from logging.handlers import QueueHandler, QueueListener
 
 # 1. # Create a single shared logger named "etl" that all modules will use
 logger = logging.getLogger("etl")
@@ -8,11 +8,32 @@ logger = logging.getLogger("etl")
 # 2. Set the minimum severity level this logger will record (ignore DEBUG, keep INFO and above - WARNING, ERROR, CRITICAL)
 logger.setLevel(logging.INFO)
 
+# 2.1. The "etl" logger has its own handlers; do not hand every record to the root logger's handlers as well
+logger.propagate = False
+
 # 3. Create a Console Stream Handler that prints log messages to the terminal
 console_handler = logging.StreamHandler()
 
 # 4. Formatter defines how console log lines should look (timestamp, level, file, line, message)
-console_formatter = logging.Formatter(
+class SecondCachedFormatter(logging.Formatter):
+    """
+    Formatter that renders %(asctime)s once per second instead of calling time.strftime for every record.
+    Only valid for a datefmt without sub-second fields.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._time_cache = (None, None)    # (second, formatted timestamp), replaced atomically
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached_second, cached_time = self._time_cache
+        if second != cached_second:
+            cached_time = super().formatTime(record, datefmt)
+            self._time_cache = (second, cached_time)
+        return cached_time
+
+console_formatter = SecondCachedFormatter(
     "[%(filename)s:%(lineno)d] - [%(asctime)s - %(levelname)s]:\n%(message)s\n",
     "%Y-%m-%d %H:%M:%S"
 )
@@ -20,28 +41,25 @@ console_formatter = logging.Formatter(
 # 5. Apply the formatter to the console handler
 console_handler.setFormatter(console_formatter)
 
-# 6. Register the console handler with the shared "etl" logger
-logger.addHandler(console_handler)
+# 6. The console handler is attached to the queue listener below (step 17), together with the file handler.
+# Set ETL_LOG_CONSOLE=0 to write to the log file only (e.g. high-volume runs whose stdout nobody reads)
+console_enabled = os.environ.get("ETL_LOG_CONSOLE", "1") != "0"
 
 # 7. Create a log folder to populate with .logs files
 # Get the absolute path of the script being executed (run_script.py)
 # Result: .../financial_data_1_ethereum/script_runner/run_script.py
 script_path = os.path.abspath(sys.argv[0])
-print(f"Absolute path of run_script.py: {script_path}")
 
 # 8. Go up ONE level to get the 'script_runner' folder
 # Result: .../financial_data_1_ethereum/script_runner
 script_runner_dir = os.path.dirname(script_path)
-print(f"Path of script_runner folder: {script_runner_dir}")
 
 # 9. Go up SECOND level to get the project root
 # Result: .../project_name
 project_root = os.path.dirname(script_runner_dir)
-print(f"Path of project root: {project_root}")
 
 # 10. Build the path to metadata/logs at the project root level
 log_dir = os.path.join(project_root, "metadata", "logs")
-print("Log dir:", log_dir)
 
 # 11. Create directory if it doesn't exist
 os.makedirs(log_dir, exist_ok=True)
@@ -63,14 +81,37 @@ log_dir = str(log_dir)
 """
 
 # 12. Build timestamped filename
-log_timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+log_timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
 log_file = os.path.join(log_dir, f"{log_timestamp}_etl.log")
 
 # 13. Make the path globally accessible in the module
 current_log_path = log_file
 
 # 14. Create a file handler in append mode
-file_handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that writes through a 64 KB buffer instead of flushing after every record.
+    The buffer is flushed on ERROR and above, by flush() below, and when logging shuts down.
+    """
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, encoding=self.encoding, errors=self.errors, buffering=65536)
+
+    def emit(self, record):
+        # With delay=True the file is only opened on the first record
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+# delay=True: no file is created until something is logged
+file_handler = BufferedFileHandler(log_file, mode="a", encoding="utf-8", delay=True)
 
 # 15. Define log format:
 # %(asctime)s -> timestamp
@@ -79,7 +120,7 @@ file_handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
 # %(lineno)d -> line number where logger was called
 # %(message)s -> actual log message
 
-file_formatter = logging.Formatter(
+file_formatter = SecondCachedFormatter(
     "[%(filename)s:%(lineno)d] - [%(asctime)s - %(levelname)s]:\n%(message)s\n",
     "%Y-%m-%d %H:%M:%S"
 )
@@ -87,8 +128,58 @@ file_formatter = logging.Formatter(
 # 16. Attach the file formatter to the handler
 file_handler.setFormatter(file_formatter)
 
-# 17. Attach the configured handler to the "etl" logger
-logger.addHandler(file_handler)
+# 17. Move the console and file I/O off the calling threads.
+# The logger only puts records on a queue; a single listener thread writes them to the handlers.
+# The "etl" logger is process-wide: if another copy of this module already installed the queue
+# (e.g. imported under a different package path), reuse its queue and log file instead of
+# attaching a second set of handlers that would write every record twice.
+queue_handler = next((h for h in logger.handlers if isinstance(h, QueueHandler)), None)
+
+if queue_handler is None:
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.file_handler = file_handler
+    logger.addHandler(queue_handler)
+    handlers = (console_handler, file_handler) if console_enabled else (file_handler,)
+    queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    queue_listener.start()
+    queue_handler.listener_stopped = False
+
+    # 18. Write out the remaining records when the interpreter exits (e.g. on sys.exit).
+    # The flag is kept on the handler, so flush() of every copy of this module can see it
+    def _stop_listener() -> None:
+        queue_listener.stop()
+        queue_handler.listener_stopped = True
+
+    atexit.register(_stop_listener)
+else:
+    # The handler created above was never opened (delay=True), so no extra file is left behind
+    log_queue = queue_handler.queue
+    file_handler = queue_handler.file_handler
+    current_log_path = file_handler.baseFilename
+
+
+def flush(timeout: float = 5.0) -> None:
+    """
+    Wait until the listener has written every queued record to the handlers,
+    then flush the file buffer.
+    Called before the log file is read back, so the task logs are complete.
+
+    The wait is skipped once the listener has stopped (nothing would drain the queue any more)
+    and is bounded by timeout otherwise, so a dead listener thread cannot hang the caller.
+
+    Args:
+        timeout: Maximum number of seconds to wait for the queue to drain.
+    """
+    if not queue_handler.listener_stopped:
+        deadline = time.monotonic() + timeout
+        with log_queue.all_tasks_done:
+            while log_queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                log_queue.all_tasks_done.wait(remaining)
+    file_handler.flush()
 
 
 def cleanup_old_logs(log_dir: str, retention_number: int = 5, is_enabled: bool = True, mode: str = 'N') -> None:
@@ -96,6 +187,8 @@ def cleanup_old_logs(log_dir: str, retention_number: int = 5, is_enabled: bool =
     Delete old logs based on selected mode and retention number.
     If mode = 'N', the function will delete logs after the N newest files.
     If mode = 'R', the function will delete logs based on age (older then X days).
+    The age-based sweep runs at most once per day: a sentinel file .purged_<YYYYMMDD> in log_dir
+    marks that today's sweep is done, and later runs of the same day skip the directory scan.
 
     Args:
         log_dir: directory of the log folder
@@ -116,14 +209,21 @@ def cleanup_old_logs(log_dir: str, retention_number: int = 5, is_enabled: bool =
         print(f"Warning: Log directory {log_dir} does not exist. Skipping cleanup.")
         return
 
-    # 3. List all log files in the directory
+    # 2.1. The age-based sweep can only find new candidates once a day
+    sentinel = os.path.join(log_dir, f".purged_{time.strftime('%Y%m%d')}")
+    if mode == 'R' and os.path.exists(sentinel):
+        return
+
+    # 3. List all log files in the directory with their modification times, in a single scandir pass.
+    # The name filter runs first, so stat() is only issued for log files.
     # Expected output:
-    # ['C:/.../2026-01-10_12-00-00_etl.log', 'C:/.../2026-01-11_09-30-22_etl.log', ...]
-    files = [
-        os.path.join(log_dir, f)
-        for f in os.listdir(log_dir)
-        if os.path.isfile(os.path.join(log_dir, f)) and f.endswith("_etl.log")
-    ]
+    # [('C:/.../2026-01-10_12-00-00_etl.log', 1768039200.0), ('C:/.../2026-01-11_09-30-22_etl.log', 1768123822.0), ...]
+    with os.scandir(log_dir) as entries:
+        files = [
+            (entry.path, entry.stat().st_mtime)
+            for entry in entries
+            if entry.name.endswith("_etl.log") and entry.is_file(follow_symlinks=False)
+        ]
 
     # 4. Delete logs based on N newest files.
     if mode == 'N':
@@ -132,11 +232,11 @@ def cleanup_old_logs(log_dir: str, retention_number: int = 5, is_enabled: bool =
         """
 
         # 4.1. Sort files by modification time (oldest first, newest file last)
-        files.sort(key=lambda f: os.path.getmtime(f))
+        files.sort(key=lambda f: f[1])
 
         # 4.2. If we have more than retention_number files, delete the oldest ones
         while len(files) > retention_number:
-            old_file = files.pop(0)
+            old_file, _ = files.pop(0)
             try:
                 os.remove(old_file)
             except Exception as ex:
@@ -148,18 +248,16 @@ def cleanup_old_logs(log_dir: str, retention_number: int = 5, is_enabled: bool =
         Delete based on age (older than X days).
         """
 
-        now = datetime.now().timestamp()
-
-        for file_path in files:
+        now = time.time()
 
-            # 5.1. Calculate the file modification time (e.g., 1768237278.4399505)
-            file_modification_time = os.path.getmtime(file_path)
+        # 5.1. Files modified before the cutoff are older than the retention period (there are 86400 seconds in a day)
+        cutoff = now - retention_number * 86400
 
-            # 5.2. Calculate the age of the file in days (there are 86400 seconds in a day)
-            age_in_days = (now - file_modification_time) / 86400
+        # 5.2. The file modification time (e.g., 1768237278.4399505) comes from the scandir pass
+        for file_path, file_modification_time in files:
 
             # 5.3. If a file is older than the retention period, delete it
-            if age_in_days > retention_number:
+            if file_modification_time < cutoff:
                 try:
                     # 5.4. Remove the file at the given path
                     os.remove(file_path)
@@ -167,11 +265,22 @@ def cleanup_old_logs(log_dir: str, retention_number: int = 5, is_enabled: bool =
                     # 5.5. If a deletion fails, log the error
                     print(f"Failed to delete old log {file_path}: {exc}")
 
+        # 5.6. Mark today's sweep as done and drop the sentinels of previous days
+        try:
+            with os.scandir(log_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(".purged_") and entry.path != sentinel:
+                        os.remove(entry.path)
+            open(sentinel, "w").close()
+        except Exception as exc:
+            print(f"Failed to update the log cleanup sentinel {sentinel}: {exc}")
+
 
 def get_current_log_content():
     """
     Reads the content of the current log file.
     """
+    flush()
     try:
         if os.path.exists(current_log_path):
             with open(current_log_path, 'r', encoding='utf-8') as f:
@@ -188,6 +297,7 @@ def get_current_log_size() -> int:
 
     Returns: bytes size
     """
+    flush()
     try:
         # Check if current_log_path is defined and the file exists
         if 'current_log_path' in globals() and os.path.exists(current_log_path):
@@ -203,6 +313,7 @@ def get_logs_from_position(position: int) -> str:
     1. Reads and returns the log content from a specific byte offset to the end.
     2. This isolates the logs for a specific task.
     """
+    flush()
     try:
         if 'current_log_path' in globals() and os.path.exists(current_log_path):
             with open(current_log_path, 'r', encoding='utf-8', errors='ignore') as f:
@@ -224,7 +335,9 @@ def _log(func, *args, **kwargs):
     """
 
     # 1. Detect whether we're currently inside an exception handler (except block). If so, include the error trace
-    # sys.exc_info()[0] is non‑None only when an exception is actively being handled.
+    # sys.exception() is non‑None only when an exception is actively being handled.
+    # Unlike sys.exc_info(), it doesn't build a 3-tuple on every log call, and it's only
+    # evaluated when the caller didn't explicitly pass exc_info.
     # If the caller didn't explicitly pass exc_info=True (and we are inside an exception handler),
     # then we set it automatically.
 
@@ -232,7 +345,7 @@ def _log(func, *args, **kwargs):
     #   lg.info("The task failed")
     # instead of:
     #   lg.info("The task failed", exc_info=True)
-    if 'exc_info' not in kwargs and sys.exc_info()[0]:
+    if 'exc_info' not in kwargs and sys.exception() is not None:
         kwargs['exc_info'] = True
 
 
@@ -265,20 +378,28 @@ def _log(func, *args, **kwargs):
 # instead of:
 #     logger.info("Starting ETL run", stacklevel=3, exc_info=True)
 
+# Each wrapper returns early when its level is disabled (logger.isEnabledFor caches the answer),
+# so filtered calls skip the exception check and the kwargs handling in _log().
+
 def info(msg, *args, **kwargs):
-    _log(logger.info, msg, *args, **kwargs)
+    if logger.isEnabledFor(logging.INFO):
+        _log(logger.info, msg, *args, **kwargs)
 
 def error(msg, *args, **kwargs):
-    _log(logger.error, msg, *args, **kwargs)
+    if logger.isEnabledFor(logging.ERROR):
+        _log(logger.error, msg, *args, **kwargs)
 
 def warning(msg, *args, **kwargs):
-    _log(logger.warning, msg, *args, **kwargs)
+    if logger.isEnabledFor(logging.WARNING):
+        _log(logger.warning, msg, *args, **kwargs)
 
 def debug(msg, *args, **kwargs):
-    _log(logger.debug, msg, *args, **kwargs)
+    if logger.isEnabledFor(logging.DEBUG):
+        _log(logger.debug, msg, *args, **kwargs)
 
 def critical(msg, *args, **kwargs):
-    _log(logger.critical, msg, *args, **kwargs)
+    if logger.isEnabledFor(logging.CRITICAL):
+        _log(logger.critical, msg, *args, **kwargs)
 
 # Special case: logger.exception already forces exc_info=True,
 # so we call it directly without going through _log() to avoid:
@@ -1,8 +1,35 @@
+# Import libraries
+from collections import defaultdict
+from concurrent.futures import Executor, wait, FIRST_COMPLETED
+import random, time, heapq, itertools
+
+# import custom libraries
+import utilities.logging_manager as lg
+from utilities.error_utils import DependencyError, ETLError, RetryableError
+
 # ===========================================================
 # Orchestration helpers that may be implemented
 # ===========================================================
 
 # 1 Retry wrappers
+# A process-local generator, so concurrent processes don't share a jitter sequence
+_rng = random.Random()
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """
+    Capped exponential backoff with full jitter.
+    Spreading the retries over the whole window keeps failing workers from retrying in lockstep.
+
+    Args:
+        attempt: The number of the failed attempt, starting from 0.
+        base: The delay window (in seconds) for the first retry.
+        cap: The maximum delay window (in seconds).
+
+    Returns:
+        The number of seconds to wait before the next attempt.
+    """
+    return _rng.uniform(0, min(cap, base * (2 ** attempt)))
+
 def retry_operation(self):
     """Retry a function call with exponential backoff."""
     pass
@@ -20,4 +47,266 @@ def log_performance_metrics(self):
 # 4 Dependency checks
 def check_dependencies(self):
     """Check if required files, tables, or configs exist before ETL."""
-    pass
\ No newline at end of file
+    pass
+
+# 5 Topological levels
+def build_task_levels(tasks: list) -> list:
+    """
+    Group tasks into topological levels using Kahn's algorithm on their 'depends_on' keys
+    (see task_dependencies).
+
+    Tasks in the same level don't depend on each other and can run concurrently.
+    A dependency that is not part of 'tasks' (e.g. a disabled task) doesn't create an edge;
+    the runner's dependency check decides whether such a task may run.
+
+    Args:
+        tasks: A list of task dictionaries with 'task_name' and 'depends_on' keys.
+
+    Returns:
+        A list of levels, each level being a list of task dictionaries in definition order.
+    """
+    # 1. Build the edges parent -> children and the in-degree of every task
+    task_names = {task["task_name"] for task in tasks}
+    children = defaultdict(list)
+    indegree = {}
+
+    for task in tasks:
+        parents = [parent for parent in task_dependencies(task) if parent in task_names]
+        for parent in parents:
+            children[parent].append(task)
+        indegree[task["task_name"]] = len(parents)
+
+    # 2. Peel off the tasks without pending dependencies, level by level
+    levels = []
+    level = [task for task in tasks if indegree[task["task_name"]] == 0]
+
+    while level:
+        levels.append(level)
+        next_level = []
+        for task in level:
+            for child in children[task["task_name"]]:
+                indegree[child["task_name"]] -= 1
+                if indegree[child["task_name"]] == 0:
+                    next_level.append(child)
+        level = next_level
+
+    return levels
+
+
+# 6 Task graph validation
+def validate_task_graph(tasks: list) -> None:
+    """
+    Validate the task dependency graph once, before anything is executed.
+
+    Args:
+        tasks: A list of task dictionaries with 'task_name' and 'depends_on' keys.
+
+    Raises:
+        DependencyError: On duplicate task names, unknown 'depends_on' references or dependency cycles.
+    """
+    # 1. Task names must be unique, otherwise 'depends_on' is ambiguous
+    task_names = [task["task_name"] for task in tasks]
+    duplicates = sorted({name for name in task_names if task_names.count(name) > 1})
+    if duplicates:
+        raise DependencyError(f"Duplicate task names: {duplicates}")
+
+    # 2. Every dependency must refer to a defined task
+    unknown = [(task["task_name"], parent) for task in tasks
+               for parent in task_dependencies(task) if parent not in task_names]
+    if unknown:
+        raise DependencyError(f"Unknown 'depends_on' references (task, dependency): {unknown}")
+
+    # 3. Kahn's algorithm leaves the tasks of a cycle out of the levels
+    leveled = {task["task_name"] for level in build_task_levels(tasks) for task in level}
+    remaining = [name for name in task_names if name not in leveled]
+    if remaining:
+        raise DependencyError(f"Dependency cycle between tasks: {remaining}")
+
+
+# 7 Task dependencies
+def task_dependencies(task: dict) -> list:
+    """
+    Normalize the 'depends_on' key of a task: None, a task name or a list of task names.
+
+    Args:
+        task: A task dictionary.
+
+    Returns:
+        The list of the task names the task depends on (empty when it has no dependency).
+    """
+    depends_on = task["depends_on"]
+    if not depends_on:
+        return []
+    if isinstance(depends_on, str):
+        return [depends_on]
+    return list(depends_on)
+
+
+# 8 Task graph execution
+def run_task_attempt(task: dict, attempt: int):
+    """
+    Execute a single attempt of a task. It runs in a worker thread of run_task_graph().
+
+    Args:
+        task: A task dictionary from factory.tasks.
+        attempt: The number of the attempt (0 = initial run).
+
+    Returns:
+        None on success, otherwise the raised exception.
+    """
+    try:
+        if attempt > 0:
+            lg.info("Retrying task '%s'... (Attempt %s of %s)", task["task_name"], attempt, task["retries"])
+
+        lg.info("Executing: %s - %s", task["task_name"], task["description"])
+
+        # Trigger the partial function with all its pre-set arguments
+        task["function"]()
+        return None
+
+    except Exception as e:
+        lg.info("Attempt %s failed for '%s': %s", attempt, task["task_name"], e)
+        return e
+
+
+def run_task_graph(executor: Executor, plan: list, collect_logs: bool = True) -> dict:
+    """
+    Run the enabled tasks as a dependency graph, each with its own retries.
+
+    A task is submitted as soon as all the tasks it depends on have succeeded, without waiting for
+    unrelated tasks to finish. After the first failure no new task is started; the running ones finish.
+
+    A failed attempt doesn't sleep in its worker thread: the retry is put on a heap with its due time
+    and the main thread re-submits it when the backoff delay has passed. Meanwhile, the worker slot
+    is free for the other tasks.
+
+    Args:
+        executor: The thread pool that executes the attempts.
+        plan: The enabled task dictionaries.
+        collect_logs: If False, the task logs are not read back from the log file (e.g. no e-mail will be sent).
+
+    Returns:
+        A dictionary {task_name: (status, message, task_specific_logs)} with an entry for every task of the plan,
+        the status being 'SUCCESS', 'FAILED' or 'SKIPPED'.
+        When several tasks run at the same time, their log blocks may contain each other's lines.
+    """
+    results = {}             # task_name -> (status, message, task_specific_logs)
+    log_start_positions = {} # task_name -> a pointer for the start of a task in the log file
+    pending = {}             # future -> (task, attempt)
+    scheduled = []           # heap of (due time, sequence, task, attempt) for the retries
+    sequence = itertools.count()
+    halted = False           # set by the first failure: no new task is started afterwards
+
+    # 1. Index the children and the number of pending dependencies of every task.
+    # A dependency outside the plan (e.g. a disabled task) can never succeed in this run.
+    plan_names = {task["task_name"] for task in plan}
+    children = defaultdict(list)
+    remaining = {}           # task_name -> number of dependencies that have not succeeded yet
+    for task in plan:
+        dependencies = task_dependencies(task)
+        for parent in dependencies:
+            if parent in plan_names:
+                children[parent].append(task)
+        remaining[task["task_name"]] = len(dependencies)
+
+    def finish(task: dict, status: str, message: str = "") -> None:
+        # Read the log content of the task from its byte offset to the end
+        t_name = task["task_name"]
+        logs = lg.get_logs_from_position(log_start_positions[t_name]) if collect_logs and t_name in log_start_positions else ""
+        results[t_name] = (status, message, logs)
+
+    def skip_descendants(task: dict) -> None:
+        # Tasks that depend (directly or not) on a task that did not succeed can't run.
+        # The children of a failed task name it; further down, the reason of the skipped task is carried through
+        status, message, _ = results[task["task_name"]]
+        reason = f"Dependency {task['task_name']} failed." if status == "FAILED" else message
+        for child in children[task["task_name"]]:
+            if child["task_name"] in results:
+                continue
+            lg.info("Skipping task '%s': %s", child["task_name"], reason)
+            results[child["task_name"]] = ("SKIPPED", reason, "")
+            skip_descendants(child)
+
+    def unblocked_children(task: dict) -> list:
+        # The children whose last pending dependency was the (successful) task
+        unblocked = []
+        for child in children[task["task_name"]]:
+            remaining[child["task_name"]] -= 1
+            if remaining[child["task_name"]] == 0 and child["task_name"] not in results:
+                unblocked.append(child)
+        return unblocked
+
+    def start(tasks: list) -> None:
+        # Submit the first attempt of every task
+        for task in tasks:
+            t_name = task["task_name"]
+
+            if halted:
+                lg.info("Skipping task '%s': the pipeline was halted.", t_name)
+                results[t_name] = ("SKIPPED", "Pipeline halted after a failure.", "")
+                skip_descendants(task)
+                continue
+
+            log_start_positions[t_name] = lg.get_current_log_size()
+            pending[executor.submit(run_task_attempt, task, 0)] = (task, 0)
+
+    # 2. Start the tasks without dependencies; the ones with a dependency outside the plan are skipped
+    for task in plan:
+        missing = [t_dep for t_dep in task_dependencies(task) if t_dep not in plan_names]
+        if missing and task["task_name"] not in results:
+            t_dep = missing[0]
+            lg.info("Stopping pipeline: Task '%s' depends on '%s', but '%s' was not successful.", task["task_name"], t_dep, t_dep)
+            results[task["task_name"]] = ("SKIPPED", f"Dependency {t_dep} is not enabled.", "")
+            skip_descendants(task)
+
+    start([task for task in plan if remaining[task["task_name"]] == 0])
+
+    # 3. Collect the attempts as they complete, schedule the retries and start the unblocked tasks
+    while pending or scheduled:
+        timeout = max(0.0, scheduled[0][0] - time.monotonic()) if scheduled else None
+
+        # wait() returns right away without futures, so sleep until the next retry is due instead
+        if pending:
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        else:
+            time.sleep(timeout)
+            done = set()
+
+        for future in done:
+            task, attempt = pending.pop(future)
+            t_name = task["task_name"]
+            error = future.result()
+
+            if error is None:
+                finish(task, "SUCCESS")
+                start(unblocked_children(task))
+                continue
+
+            # Classified ETL errors that are not retryable (configuration, schema, data ...) fail fast.
+            # Unclassified exceptions (e.g. driver errors) keep the retry behaviour.
+            if isinstance(error, ETLError) and not isinstance(error, RetryableError):
+                lg.info("Task '%s' raised a non-retryable %s, skipping the remaining attempts.", t_name, type(error).__name__)
+
+            # If there are still retries left, wait (exponential backoff with jitter) before trying again
+            elif attempt < task["retries"]:
+                delay = backoff_delay(attempt)
+                lg.info("Waiting %.2f seconds before next retry...", delay)
+                heapq.heappush(scheduled, (time.monotonic() + delay, next(sequence), task, attempt + 1))
+                continue
+
+            else:
+                lg.info("Task '%s' exhausted all retry attempts.", t_name)
+
+            # The task failed: halt the pipeline to prevent inconsistent states in the downstream tasks
+            finish(task, "FAILED", "See Technical Log Details below")
+            skip_descendants(task)
+            if not halted:
+                halted = True
+                lg.info("Pipeline execution halted due to failure in: %s", t_name)
+
+        # 4. Re-submit the retries that are due
+        while scheduled and scheduled[0][0] <= time.monotonic():
+            _, _, task, attempt = heapq.heappop(scheduled)
+            pending[executor.submit(run_task_attempt, task, attempt)] = (task, attempt)
+
+    return results